@@ -1,12 +1,62 @@
+import os
 import streamlit as st
-from solver import load_word_list, solve
+from solver import load_word_list, game_state_key
+from background import BackgroundRanker
+from openers import OPENER_TABLE_DIR, OpenerTable
+from session import SolverSession
+from suggestion_cache import SuggestionCache, SqliteStore
+from wordlists import load_lexicon
+
+@st.cache_resource
+def get_suggestion_cache():
+    """One suggestion cache per process, shared by every session."""
+    db_path = os.environ.get("WORDLE_SUGGESTION_DB")
+    store = SqliteStore(db_path, ttl=24 * 3600) if db_path else None
+    return SuggestionCache(maxsize=4096, ttl=3600, store=store)
+
+@st.cache_resource
+def get_opener_table():
+    """Precomputed turn-two suggestions (python openers.py build), if available."""
+    try:
+        return OpenerTable.load(os.environ.get("WORDLE_OPENER_TABLE", OPENER_TABLE_DIR))
+    except (FileNotFoundError, ValueError):
+        return None
+
+@st.cache_resource
+def get_background_ranker():
+    """Shared executor for slow rankings, so they never block a script run."""
+    return BackgroundRanker(get_suggestion_cache(), max_workers=2)
 
 # Load words with cache busting
 import time
+# Allowed guesses and possible answers, from WORDLE_ALLOWED / WORDLE_ANSWERS if set
+LEXICON = load_lexicon()
 WORDS = load_word_list()
+SUGGESTION_CACHE = get_suggestion_cache()
+OPENER_TABLE = get_opener_table()
+BACKGROUND_RANKER = get_background_ranker()
 st.sidebar.write(f"Word list loaded at: {time.strftime('%H:%M:%S')}")
 st.sidebar.write(f"Total words: {len(WORDS)}")
+if LEXICON.curated:
+    st.sidebar.write(f"Possible answers: {len(LEXICON.answers)}")
 st.sidebar.write(f"Contains 'miaou': {'miaou' in WORDS}")
+ranking_mode = st.sidebar.selectbox(
+    "Ranking mode",
+    ["frequency", "bayes", "positional"],
+    help="frequency: most common words first. bayes: words that best split the likely answers first. "
+         "positional: words built from the letters most common among the remaining candidates.",
+)
+cache_stats = SUGGESTION_CACHE.stats()
+st.sidebar.write(
+    f"Suggestion cache: {cache_stats['size']}/{cache_stats['maxsize']} states, "
+    f"{cache_stats['hits'] + cache_stats['store_hits']} hits, {cache_stats['misses']} misses, "
+    f"{cache_stats['evictions']} evictions"
+)
+ranker_stats = BACKGROUND_RANKER.stats()
+st.sidebar.write(
+    f"Background ranking: {ranker_stats['inflight']} running, {ranker_stats['submitted']} started, "
+    f"{ranker_stats['joined']} shared, {ranker_stats['cancelled']} cancelled"
+)
 
 st.set_page_config(page_title="Wordle Solver", page_icon="🟩", layout="centered")
 
@@ -33,10 +83,16 @@ if "guesses" not in st.session_state:
     st.session_state.guesses = []
 if "current_suggestions" not in st.session_state:
     st.session_state.current_suggestions = []
+if "match_count" not in st.session_state:
+    st.session_state.match_count = 0
+if "pending_job" not in st.session_state:
+    st.session_state.pending_job = None
 if "game_won" not in st.session_state:
     st.session_state.game_won = False
 if "enter_pressed" not in st.session_state:
     st.session_state.enter_pressed = False
+if "solver" not in st.session_state:
+    st.session_state.solver = SolverSession()
 
 # Show current game state
 if st.session_state.guesses:
@@ -49,25 +105,11 @@ if st.session_state.guesses:
     # Show current constraints
     st.markdown("#### 📊 Current Constraints:")
     
-    # Analyze current state
-    pattern = ["."] * 5
-    yellow_letters = []
-    gray_letters = []
-    green_positions = {}
-
-    for g, c in st.session_state.guesses:
-        for i, (letter, color) in enumerate(zip(g, c)):
-            if color == "🟩":  # green
-                pattern[i] = letter
-                green_positions[i] = letter
-            elif color == "🟨":  # yellow
-                yellow_letters.append(letter)
-            elif color == "⬜":  # gray
-                gray_letters.append(letter)
-
-    # Remove duplicates and show constraints
-    yellow_letters = list(set(yellow_letters))
-    gray_letters = list(set(gray_letters))
+    # Constraints are tracked incrementally by the solver session
+    solver = st.session_state.solver
+    green_positions = dict(sorted(solver.green.items()))
+    yellow_letters = sorted(solver.yellow)
+    gray_letters = sorted(solver.gray)
     
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -84,6 +126,20 @@ if st.session_state.guesses:
     if gray_letters:
         st.write(f"**Cannot contain:** {', '.join([l.upper() for l in gray_letters])}")
     
+    with st.expander(f"🔥 Letter heatmap ({len(solver)} candidates left)"):
+        heatmap = solver.heatmap()
+        st.dataframe(
+            {
+                "Letter": [letter.upper() for letter in heatmap],
+                **{str(pos + 1): [shares[pos] for shares in heatmap.values()] for pos in range(5)},
+            },
+            column_config={
+                str(pos + 1): st.column_config.ProgressColumn(f"Pos {pos + 1}", min_value=0, max_value=1, format="%.2f")
+                for pos in range(5)
+            },
+            hide_index=True,
+        )
+    
     st.markdown("---")
 
 # Input for new guess
@@ -107,8 +163,8 @@ if guess != st.session_state.input_guess:
 if guess:
     if len(guess) != 5:
         st.error("Please enter exactly 5 letters.")
-    elif not guess.isalpha():
-        st.error("Please enter only letters.")
+    elif not (guess.isascii() and guess.isalpha()):
+        st.error("Please enter only the letters A-Z.")
     elif guess.lower() not in WORDS:
         # Debug information
         st.warning(f"'{guess}' is not in our word list, but you can still use it.")
@@ -118,7 +174,7 @@ if guess:
             st.write(f"Found: {guess.lower() in WORDS}")
             st.write(f"Words starting with '{guess.lower()[:3]}': {[w for w in WORDS if w.startswith(guess.lower()[:3])]}")
 
-if guess and len(guess) == 5 and guess.isalpha():
+if guess and len(guess) == 5 and guess.isascii() and guess.isalpha():
     colors = []
     st.write("Click to mark each letter's status:")
     cols = st.columns(5)
@@ -155,6 +211,9 @@ if guess and len(guess) == 5 and guess.isalpha():
     
     # Handle form submission
     if submit_button:
+        # Narrow the session's candidates first; it validates the guess
+        # before the history changes
+        st.session_state.solver.add_guess(guess.lower(), colors)
         # Add the guess (convert to lowercase for processing)
         st.session_state.guesses.append((guess.lower(), colors))
         
@@ -172,24 +231,36 @@ if guess and len(guess) == 5 and guess.isalpha():
         # Clear the input field immediately
         st.session_state.input_guess = ""
         
-        # Get suggestions
-        pattern = ["."] * 5
-        yellow_letters = []
-        gray_letters = []
-
-        for g, c in st.session_state.guesses:
-            for i, (letter, color) in enumerate(zip(g, c)):
-                if color == "🟩":  # green
-                    pattern[i] = letter
-                elif color == "🟨":  # yellow
-                    yellow_letters.append(letter)
-                elif color == "⬜":  # gray
-                    gray_letters.append(letter)
-
-        # Convert pattern to regex format
-        pattern_regex = "^" + "".join(pattern) + "$"
-        results = solve(pattern_regex, yellow_letters, gray_letters)
+        # Get suggestions shared across sessions that reach the same constraints
+        table_hit = None
+        if OPENER_TABLE is not None and OPENER_TABLE.mode == ranking_mode and len(st.session_state.guesses) == 1:
+            # Turn two is a single lookup in the precomputed opener table
+            table_hit = OPENER_TABLE.lookup(guess.lower(), colors)
+        # A newer guess supersedes any ranking still running for the old one
+        if st.session_state.pending_job is not None:
+            st.session_state.pending_job.cancel()
+            st.session_state.pending_job = None
+        # The lexicon key keeps processes with different word lists apart in a shared store
+        cache_key = f"{LEXICON.key}|{ranking_mode}|{game_state_key(st.session_state.guesses)}"
+        if table_hit is not None:
+            match_count, results = table_hit
+        elif ranking_mode == "frequency":
+            results = SUGGESTION_CACHE.get_or_compute(
+                cache_key, lambda: st.session_state.solver.suggestions(ranking_mode)
+            )
+            match_count = len(results)
+        else:
+            # Show frequency order right away and upgrade when the full
+            # ranking finishes in the background
+            results = SUGGESTION_CACHE.get(cache_key)
+            if results is None:
+                st.session_state.pending_job = BACKGROUND_RANKER.submit(
+                    cache_key, st.session_state.solver.deferred_suggestions(ranking_mode)
+                )
+                results = st.session_state.solver.suggestions("frequency")
+            match_count = len(results)
         st.session_state.current_suggestions = results
+        st.session_state.match_count = match_count
         
         st.rerun()
     
@@ -210,14 +281,34 @@ if guess and len(guess) == 5 and guess.isalpha():
         st.write(f"Game won: {st.session_state.game_won}")
         st.write(f"Number of guesses: {len(st.session_state.guesses)}")
 
+# Swap in the full ranking once the background job is done. Clear the job
+# first so a failed ranking can never leave the page polling forever.
+pending_job = st.session_state.pending_job
+if pending_job is not None and pending_job.done():
+    st.session_state.pending_job = None
+    ranked = pending_job.result()
+    if ranked is not None:
+        st.session_state.current_suggestions = ranked
+
 # Show suggestions
 if st.session_state.current_suggestions:
     st.markdown("### 💡 AI Suggestions for Next Guess")
     
+    if st.session_state.pending_job is not None:
+        @st.fragment(run_every=0.5)
+        def wait_for_ranking():
+            job = st.session_state.pending_job
+            if job is None or job.done():
+                st.rerun(scope="app")
+            st.info("⏳ Ranking suggestions... showing the most common words until it's ready.")
+        
+        wait_for_ranking()
+    
     results = st.session_state.current_suggestions
+    match_count = st.session_state.match_count
     
     if results:
-        st.success(f"🎯 Found {len(results)} possible words!")
+        st.success(f"🎯 Found {match_count} possible words!")
         
         # Display top 10 suggestions with clickable buttons
         st.markdown("**Click a suggestion to use it as your next guess:**")
@@ -237,22 +328,22 @@ if st.session_state.current_suggestions:
                     # Force a rerun to update the input field
                     st.rerun()
         
-        if len(results) > 10:
-            st.info(f"Showing top 10 of {len(results)} suggestions. Try these common words first!")
+        if match_count > 10:
+            st.info(f"Showing top 10 of {match_count} suggestions. Try these common words first!")
         
         # Show some statistics
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Matches", len(results))
+            st.metric("Total Matches", match_count)
         with col2:
             st.metric("Top Suggestion", results[0].upper())
         with col3:
             st.metric("Unique Letters", len(set(results[0])))
         
         # Show if we're getting close
-        if len(results) <= 5:
+        if match_count <= 5:
             st.success("🎉 You're getting close! Only a few possibilities left!")
-        elif len(results) <= 20:
+        elif match_count <= 20:
             st.info("🔍 Good progress! Narrowing down the possibilities.")
     else:
         st.error("❌ No words found! Check your inputs or try a different approach.")
@@ -273,9 +364,14 @@ if st.session_state.game_won:
 if st.button("🔄 Reset Game"):
     st.session_state.guesses = []
     st.session_state.current_suggestions = []
+    st.session_state.match_count = 0
+    if st.session_state.pending_job is not None:
+        st.session_state.pending_job.cancel()
+    st.session_state.pending_job = None
     st.session_state.input_guess = ""
     st.session_state.game_won = False
     st.session_state.winning_word = ""
+    st.session_state.solver = SolverSession()
     for i in range(5):
         if f"color_{i}" in st.session_state:
             del st.session_state[f"color_{i}"]
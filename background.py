@@ -0,0 +1,113 @@
+# background.py
+import logging
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+class SuggestionJob:
+    """
+    One session's handle on a background ranking. Several sessions asking
+    for the same game state share the underlying computation.
+    """
+
+    def __init__(self, ranker, key, future):
+        self.ranker = ranker
+        self.key = key
+        self.future = future
+        self.cancelled = False
+
+    def done(self):
+        return self.cancelled or self.future.done()
+
+    def result(self):
+        """The ranked suggestions, or None if cancelled or failed (failures are logged)."""
+        if self.cancelled:
+            return None
+        try:
+            return self.future.result()
+        except CancelledError:
+            return None
+        except Exception:
+            logger.exception("Background ranking for %r failed", self.key)
+            return None
+
+    def cancel(self):
+        """
+        Drop this session's interest. The computation is cancelled once no
+        session is waiting for it; one already running finishes and still
+        fills the suggestion cache.
+        """
+        if not self.cancelled:
+            self.cancelled = True
+            self.ranker._release(self.key, self.future)
+
+
+class BackgroundRanker:
+    """
+    Shared executor that computes suggestions off the Streamlit script
+    thread and stores them in a ``SuggestionCache``.
+    """
+
+    def __init__(self, cache, max_workers=2):
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="suggestions")
+        self._lock = threading.RLock()
+        self._inflight = {}
+        self.submitted = 0
+        self.joined = 0
+        self.cancelled = 0
+
+    def submit(self, key, compute):
+        """
+        Start computing suggestions for ``key`` with ``compute()`` unless an
+        identical job is already running, in which case join it. The caller
+        has already missed the cache, so the job only stores its result.
+        """
+        with self._lock:
+            entry = self._inflight.get(key)
+            # A finished future may not have run its callback yet; never join it
+            if entry is not None and not entry[0].done():
+                entry[1] += 1
+                self.joined += 1
+                return SuggestionJob(self, key, entry[0])
+            future = self._executor.submit(self._compute, key, compute)
+            self._inflight[key] = [future, 1]
+            # Runs inline if the job already finished, hence the RLock
+            future.add_done_callback(lambda f: self._finished(key, f))
+            self.submitted += 1
+            return SuggestionJob(self, key, future)
+
+    def _compute(self, key, compute):
+        words = list(compute())
+        self.cache.put(key, words)
+        return words
+
+    def _finished(self, key, future):
+        with self._lock:
+            entry = self._inflight.get(key)
+            if entry is not None and entry[0] is future:
+                del self._inflight[key]
+
+    def _release(self, key, future):
+        with self._lock:
+            entry = self._inflight.get(key)
+            if entry is None or entry[0] is not future:
+                return
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._inflight[key]
+                if future.cancel():
+                    self.cancelled += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "inflight": len(self._inflight),
+                "submitted": self.submitted,
+                "joined": self.joined,
+                "cancelled": self.cancelled,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Self-play benchmark for the ranking modes.
+Plays games against sampled answers, always taking the top suggestion,
+and reports average guesses, failures and suggestion latency per mode.
+
+Answers are drawn uniformly from an answer list (--answers FILE, or
+WORDLE_ANSWERS). Without one they fall back to the most frequent words,
+which is what the bayes prior favours, so those results flatter it.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ranking import RANKERS, feedback_codes, word_stats
+from load_test import percentile
+from wordlists import FileSource, load_lexicon
+
+def sample_answers(stats, count, pool_size=2500, seed=0):
+    """
+    Sample answers uniformly from the curated answer list, or from the
+    ``pool_size`` most frequent words when there is none. The fallback
+    shares its bias with the frequency-based prior.
+    """
+    if stats.curated:
+        pool = [stats.words[i] for i in stats.answer_indices]
+    else:
+        pool = [stats.words[i] for i in np.argsort(-stats.freq, kind="stable")[:pool_size]]
+    return random.Random(seed).sample(pool, min(count, len(pool)))
+
+def play(stats, answer, mode, opener, max_turns=6):
+    """
+    Play one game with exact feedback filtering, guessing the top-ranked
+    candidate each turn. Returns (guesses or None, ranking latencies).
+    """
+    ranker = RANKERS[mode]
+    candidates = stats.answer_indices
+    target = stats.letters[stats.index[answer]][None, :]
+    latencies = []
+    guess = opener
+    for turn in range(1, max_turns + 1):
+        if guess == stats.index[answer]:
+            return turn, latencies
+        observed = feedback_codes(stats.letters[[guess]], target)[0, 0]
+        codes = feedback_codes(stats.letters[[guess]], stats.letters[candidates])[0]
+        candidates = candidates[(codes == observed) & (candidates != guess)]
+
+        start = time.perf_counter()
+        guess = ranker(stats, candidates)[0]
+        latencies.append(time.perf_counter() - start)
+    return None, latencies
+
+def run_benchmark(modes=None, games=200, seed=0, answers_path=None):
+    """
+    Self-play every mode against the same answers; returns per-mode stats.
+
+    answers_path -> word file to sample answers from (default: the
+                    configured lexicon's answer list, if any)
+    """
+    lexicon = load_lexicon(answers=[FileSource(answers_path)]) if answers_path else None
+    stats = word_stats(lexicon)
+    answers = sample_answers(stats, games, seed=seed)
+    results = {}
+    for mode in modes or sorted(RANKERS):
+        start = time.perf_counter()
+        opener = RANKERS[mode](stats, stats.answer_indices)[0]
+        opener_time = time.perf_counter() - start
+
+        turns, latencies = [], []
+        for answer in answers:
+            used, lat = play(stats, answer, mode, opener)
+            turns.append(used)
+            latencies.extend(lat)
+        solved = [t for t in turns if t is not None]
+        results[mode] = {
+            "opener": stats.words[opener],
+            "opener_time": opener_time,
+            "games": len(turns),
+            "solved": len(solved),
+            "avg_guesses": sum(solved) / len(solved) if solved else 0.0,
+            "curated": stats.curated,
+            "p50": percentile(latencies, 50),
+            "p99": percentile(latencies, 99),
+        }
+    return results
+
+def print_report(results):
+    print("📊 Wordle Solver Self-Play Benchmark")
+    print("=" * 40)
+    if not all(r["curated"] for r in results.values()):
+        print("⚠️  No answer list given: answers are the most frequent words, the same")
+        print("   ones the bayes prior favours. Pass --answers for an unbiased comparison.\n")
+    for mode, r in results.items():
+        print(f"{mode}:")
+        print(f"  Opener: {r['opener'].upper()} ({r['opener_time'] * 1000:.1f}ms)")
+        print(f"  Solved: {r['solved']}/{r['games']}, avg {r['avg_guesses']:.3f} guesses")
+        print(f"  Suggestion latency: p50 {r['p50'] * 1000:.2f}ms, p99 {r['p99'] * 1000:.2f}ms")
+    if "frequency" in results and "bayes" in results:
+        base, new = results["frequency"], results["bayes"]
+        print(f"\nbayes vs frequency: {new['avg_guesses'] - base['avg_guesses']:+.3f} guesses, "
+              f"{new['solved'] - base['solved']:+d} solved, "
+              f"latency p50 {(new['p50'] - base['p50']) * 1000:+.2f}ms, "
+              f"p99 {(new['p99'] - base['p99']) * 1000:+.2f}ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=200, help="answers to play per mode")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for answers")
+    parser.add_argument("--mode", action="append", choices=sorted(RANKERS), help="mode to run (repeatable)")
+    parser.add_argument("--answers", help="word file to sample answers from (default: $WORDLE_ANSWERS)")
+    args = parser.parse_args()
+
+    print_report(run_benchmark(args.mode, args.games, args.seed, args.answers))
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Headless load test for the Streamlit app.
+Replays scripted games across many concurrent simulated sessions using
+Streamlit's AppTest (no browser, no network) and reports rerun latency,
+throughput and memory growth.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+OPENERS = ['crane', 'slate', 'adieu', 'audio', 'raise']
+COLOR_CLICKS = {"⬜": 0, "🟨": 1, "🟩": 2}
+
+# AppTest swaps process-wide globals (Runtime._instance, config options) on
+# every run, so overlapping runs corrupt each other. Sessions still run
+# concurrently, but script runs take turns; since script runs are GIL-bound
+# anyway, queueing plus service time approximates what a user of a single
+# app.py process sees.
+_RUN_LOCK = threading.Lock()
+
+def rss_bytes():
+    """Current resident set size of this process, or peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is kilobytes on Linux and bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values`` (0 <= pct <= 100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+class SimulatedSession:
+    """One browser session playing scripted games through AppTest."""
+
+    def __init__(self, answers, opener, max_turns=6, timeout=60):
+        from streamlit.testing.v1 import AppTest
+
+        self.answers = answers
+        self.opener = opener
+        self.max_turns = max_turns
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.latencies = []
+        self.service_times = []
+        self.turns = []
+
+    def _rerun(self, element):
+        """Run one interaction and record its latency, including time queued."""
+        start = time.perf_counter()
+        with _RUN_LOCK:
+            started = time.perf_counter()
+            element.run()
+        end = time.perf_counter()
+        self.latencies.append(end - start)
+        self.service_times.append(end - started)
+        if self.at.exception:
+            raise RuntimeError(f"App raised: {self.at.exception[0].message}")
+
+    def _button(self, predicate):
+        for button in self.at.button:
+            if predicate(button):
+                return button
+        return None
+
+    def play_game(self, answer):
+        """Play one game against ``answer``; returns the number of guesses used."""
+        from solver import feedback
+
+        guess = self.opener
+        for turn in range(1, self.max_turns + 1):
+            # Enter the guess and cycle each letter to its feedback color
+            self._rerun(self.at.text_input(key="guess_input").input(guess.upper()))
+            colors = feedback(guess, answer)
+            for i, color in enumerate(colors):
+                for _ in range(COLOR_CLICKS[color]):
+                    self._rerun(self.at.button(key=f"btn_{i}").click())
+
+            submit = self._button(lambda b: b.label == "Add Guess & Get Suggestions")
+            self._rerun(submit.click())
+            if all(color == "🟩" for color in colors):
+                return turn
+
+            # Take the top suggestion as the next guess
+            suggestion = self._button(lambda b: b.key == "suggestion_0")
+            if suggestion is None:
+                return None
+            guess = suggestion.label.lower()
+            self._rerun(suggestion.click())
+        return None
+
+    def reset(self):
+        self._rerun(self._button(lambda b: b.label == "🔄 Reset Game").click())
+
+    def run(self):
+        self._rerun(self.at)
+        for game, answer in enumerate(self.answers):
+            if game:
+                self.reset()
+            self.turns.append(self.play_game(answer))
+        return self
+
+def run_load_test(sessions=10, concurrency=4, games=1, seed=0, answers=None):
+    """
+    Play ``games`` scripted games in each of ``sessions`` simulated sessions,
+    ``concurrency`` at a time. Returns a dict of latency and memory statistics.
+    """
+    from wordlists import load_lexicon
+
+    rng = random.Random(seed)
+    pool = answers or [w for w in load_lexicon().answers if len(set(w)) == 5]
+    plans = [
+        ([rng.choice(pool) for _ in range(games)], OPENERS[i % len(OPENERS)])
+        for i in range(sessions)
+    ]
+
+    # Warm the module-level work once so memory growth reflects sessions only
+    SimulatedSession([], OPENERS[0]).run()
+    rss_before = rss_bytes()
+
+    lock = threading.Lock()
+    peak = [rss_before]
+
+    def play(plan):
+        session = SimulatedSession(*plan).run()
+        with lock:
+            peak[0] = max(peak[0], rss_bytes())
+        return session
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        finished = list(executor.map(play, plans))
+    elapsed = time.perf_counter() - start
+    rss_after = rss_bytes()
+
+    latencies = [lat for s in finished for lat in s.latencies]
+    service_times = [t for s in finished for t in s.service_times]
+    turns = [t for s in finished for t in s.turns]
+    solved = [t for t in turns if t is not None]
+    return {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "games": len(turns),
+        "solved": len(solved),
+        "avg_guesses": sum(solved) / len(solved) if solved else 0.0,
+        "reruns": len(latencies),
+        "elapsed": elapsed,
+        "reruns_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "games_per_sec": len(turns) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies) if latencies else 0.0,
+        "service_p50": percentile(service_times, 50),
+        "service_p99": percentile(service_times, 99),
+        "rss_before": rss_before,
+        "rss_peak": peak[0],
+        "rss_after": rss_after,
+        "rss_per_session": (rss_after - rss_before) / sessions if sessions else 0.0,
+    }
+
+def print_report(stats):
+    mb = 1024 * 1024
+    print("🧪 Wordle Solver Load Test")
+    print("=" * 40)
+    print(f"Sessions: {stats['sessions']} ({stats['concurrency']} concurrent)")
+    print(f"Games: {stats['games']} ({stats['solved']} solved, avg {stats['avg_guesses']:.2f} guesses)")
+    print(f"Reruns: {stats['reruns']} in {stats['elapsed']:.2f}s")
+    print(f"Throughput: {stats['reruns_per_sec']:.1f} reruns/s, {stats['games_per_sec']:.2f} games/s")
+    print(f"Rerun latency: p50 {stats['p50'] * 1000:.1f}ms, p90 {stats['p90'] * 1000:.1f}ms, "
+          f"p99 {stats['p99'] * 1000:.1f}ms, max {stats['max'] * 1000:.1f}ms")
+    print(f"Script run time: p50 {stats['service_p50'] * 1000:.1f}ms, p99 {stats['service_p99'] * 1000:.1f}ms")
+    print(f"Memory: {stats['rss_before'] / mb:.1f}MB -> {stats['rss_after'] / mb:.1f}MB "
+          f"(peak {stats['rss_peak'] / mb:.1f}MB, {stats['rss_per_session'] / 1024:.1f}KB per session)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10, help="simulated sessions to run")
+    parser.add_argument("--concurrency", type=int, default=4, help="sessions running at once")
+    parser.add_argument("--games", type=int, default=1, help="games played per session")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for answers")
+    parser.add_argument("--answers", help="comma-separated answers instead of random words")
+    args = parser.parse_args()
+
+    answers = args.answers.split(",") if args.answers else None
+    print_report(run_load_test(args.sessions, args.concurrency, args.games, args.seed, answers))
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Offline opener tables.
+For every allowed first guess and each feedback pattern it can produce
+against the possible answers, precompute the top-N second guesses and the remaining candidate count, so
+turn-two suggestions are a single lookup at runtime.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ranking import RANKERS, feedback_codes, word_stats
+from session import COLOR_CODES, colors_code, position_constraint
+from wordlists import BASE_DIR, atomic_write, load_lexicon
+
+OPENER_TABLE_DIR = os.path.join(BASE_DIR, ".opener_table")
+TABLE_FILES = ("keys", "counts", "offsets", "suggestions")
+PATTERNS = 3 ** 5
+
+# ---------- Building ----------
+
+def _ranked_top(stats, mode, keep, top_n, frequency_order):
+    """Top ``top_n`` surviving words, in the same order the ranker would give."""
+    if mode == "frequency":
+        # rank_frequency is a fixed total order, so filter the precomputed
+        # order instead of sorting each bucket
+        return frequency_order[keep[frequency_order]][:top_n]
+    return RANKERS[mode](stats, np.flatnonzero(keep))[:top_n]
+
+
+def build_shard(guesses, mode="frequency", top_n=10):
+    """
+    Table rows for the lexicon indices ``guesses``. Returns a dict of
+    keys / counts / lengths / suggestions arrays, keys being
+    ``guess * 243 + pattern`` in ascending order.
+    """
+    stats = word_stats()
+    frequency_order = RANKERS["frequency"](stats, stats.answer_indices)
+    answers = stats.letters[stats.answer_indices]
+    keys, counts, lengths, suggestions = [], [], [], []
+    for guess in guesses:
+        word = stats.words[guess]
+        # Only patterns some answer actually produces
+        observed = np.unique(feedback_codes(stats.letters[[guess]], answers)[0])
+        squares = [
+            [position_constraint(stats, pos, word[pos], color) for color in range(3)]
+            for pos in range(5)
+        ]
+        for pattern in observed:
+            keep = squares[0][pattern % 3] & stats.answer
+            digits = int(pattern) // 3
+            for pos in range(1, 5):
+                keep &= squares[pos][digits % 3]
+                digits //= 3
+            top = _ranked_top(stats, mode, keep, top_n, frequency_order)
+            keys.append(guess * PATTERNS + int(pattern))
+            counts.append(int(keep.sum()))
+            lengths.append(len(top))
+            suggestions.extend(top)
+    return {
+        "keys": np.array(keys, dtype=np.uint32),
+        "counts": np.array(counts, dtype=np.uint32),
+        "lengths": np.array(lengths, dtype=np.uint16),
+        "suggestions": np.array(suggestions, dtype=_index_dtype(len(stats.words))),
+    }
+
+
+def _index_dtype(n_words):
+    return np.uint16 if n_words <= np.iinfo(np.uint16).max else np.uint32
+
+
+def _shard_worker(job):
+    path, guesses, mode, top_n = job
+    rows = build_shard(guesses, mode, top_n)
+    atomic_write(path, lambda f: np.savez(f, **rows))
+    return path
+
+
+def build_table(out_dir=OPENER_TABLE_DIR, mode="frequency", top_n=10, limit=None,
+                workers=None, shard_size=256, progress=None):
+    """
+    Build an opener table in ``out_dir``.
+
+    mode       -> ranking mode used for the second guesses
+    top_n      -> suggestions kept per (first guess, pattern)
+    limit      -> only the ``limit`` most frequent first guesses (default all)
+    workers    -> processes to shard across (default: all cores; 1 runs inline)
+    shard_size -> first guesses per shard
+
+    Finished shards are kept under ``out_dir`` until the final merge, so an
+    interrupted build resumes where it stopped when rerun with the same
+    arguments.
+    """
+    if mode not in RANKERS:
+        raise ValueError(f"Unknown ranking mode {mode!r}; choose from {sorted(RANKERS)}")
+    stats = word_stats()
+    guesses = np.arange(len(stats.words))
+    if limit is not None:
+        guesses = np.sort(np.argsort(-stats.freq, kind="stable")[:limit])
+
+    meta = {
+        "lexicon": load_lexicon().key,
+        "mode": mode,
+        "top_n": top_n,
+        "guesses": len(guesses),
+        "words": len(stats.words),
+    }
+    job_hash = hashlib.sha256(
+        json.dumps({**meta, "limit": limit, "shard_size": shard_size}, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:16]
+    shard_dir = os.path.join(out_dir, f"shards-{job_hash}")
+    os.makedirs(shard_dir, exist_ok=True)
+
+    jobs = []
+    for n, start in enumerate(range(0, len(guesses), shard_size)):
+        path = os.path.join(shard_dir, f"shard_{n:05d}.npz")
+        jobs.append((path, guesses[start:start + shard_size], mode, top_n))
+    pending = [job for job in jobs if not os.path.exists(job[0])]
+
+    workers = workers or os.cpu_count() or 1
+    done = len(jobs) - len(pending)
+    pool = None
+    if workers == 1 or not pending:
+        finished = map(_shard_worker, pending)
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(min(workers, len(pending)))
+        finished = pool.imap_unordered(_shard_worker, pending)
+    try:
+        for _ in finished:
+            done += 1
+            if progress:
+                progress(done, len(jobs))
+    except BaseException:
+        # Don't wait for the remaining shards; finished ones are kept for a rerun
+        if pool is not None:
+            pool.terminate()
+        raise
+    if pool is not None:
+        pool.close()
+        pool.join()
+
+    _merge_shards([job[0] for job in jobs], out_dir, meta)
+    shutil.rmtree(shard_dir)
+    return OpenerTable.load(out_dir)
+
+
+def _merge_shards(paths, out_dir, meta):
+    """Concatenate shards (already in key order) into the final table files."""
+    parts = {name: [] for name in ("keys", "counts", "lengths", "suggestions")}
+    for path in paths:
+        with np.load(path) as shard:
+            for name in parts:
+                parts[name].append(shard[name])
+    arrays = {name: np.concatenate(chunks) for name, chunks in parts.items()}
+
+    offsets = np.zeros(len(arrays["keys"]) + 1, dtype=np.uint64)
+    np.cumsum(arrays["lengths"], out=offsets[1:])
+    table = {
+        "keys": arrays["keys"],
+        "counts": arrays["counts"],
+        "offsets": offsets,
+        "suggestions": arrays["suggestions"],
+    }
+    for name in TABLE_FILES:
+        atomic_write(os.path.join(out_dir, f"{name}.npy"), lambda f: np.save(f, table[name]))
+    atomic_write(os.path.join(out_dir, "meta.json"), lambda f: f.write(json.dumps(meta, indent=2).encode("utf-8")))
+
+# ---------- Runtime ----------
+
+class OpenerTable:
+    """
+    Read-only opener table, memory-mapped from ``build_table()`` output.
+
+    keys        -> sorted uint32 ``guess * 243 + pattern``
+    counts      -> remaining candidates for each key
+    offsets     -> start of each key's slice in ``suggestions`` (len keys + 1)
+    suggestions -> lexicon indices of the top-N second guesses
+    """
+
+    def __init__(self, path, meta, arrays, stats):
+        self.path = path
+        self.meta = meta
+        self.mode = meta["mode"]
+        self.top_n = meta["top_n"]
+        self.keys = arrays["keys"]
+        self.counts = arrays["counts"]
+        self.offsets = arrays["offsets"]
+        self.suggestions = arrays["suggestions"]
+        self.stats = stats
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def load(cls, path=OPENER_TABLE_DIR):
+        """
+        Map a table from ``path``. Raises FileNotFoundError if it has not
+        been built and ValueError if it was built for a different lexicon.
+        """
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["lexicon"] != load_lexicon().key:
+            raise ValueError(f"Opener table in {path} was built for a different word list; rebuild it")
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in TABLE_FILES
+        }
+        return cls(path, meta, arrays, word_stats())
+
+    def lookup(self, guess, colors):
+        """
+        Turn-two suggestions after ``guess`` got ``colors`` (the app's
+        markers). Returns (remaining count, top-N words), or None if the
+        pair is not in the table.
+        """
+        guess = guess.lower()
+        if guess not in self.stats or len(colors) != 5 or any(c not in COLOR_CODES for c in colors):
+            return None
+        key = self.stats.index[guess] * PATTERNS + colors_code(colors)
+        row = int(np.searchsorted(self.keys, key))
+        if row == len(self.keys) or self.keys[row] != key:
+            return None
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        words = [self.stats.words[i] for i in self.suggestions[start:end]]
+        return int(self.counts[row]), words
+
+# ---------- CLI ----------
+
+COLOR_MARKERS = {"b": "⬜", "x": "⬜", "0": "⬜", "y": "🟨", "1": "🟨", "g": "🟩", "2": "🟩"}
+
+def _parse_colors(text):
+    """'gygbb' / '21200' style feedback to the app's markers, or None if malformed."""
+    text = text.lower()
+    if len(text) != 5 or any(c not in COLOR_MARKERS for c in text):
+        return None
+    return [COLOR_MARKERS[c] for c in text]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="precompute the table")
+    build.add_argument("--out", default=OPENER_TABLE_DIR, help="output directory")
+    build.add_argument("--mode", default="frequency", choices=sorted(RANKERS), help="ranking mode")
+    build.add_argument("--top-n", type=int, default=10, help="suggestions kept per pattern")
+    build.add_argument("--limit", type=int, help="only the N most frequent first guesses")
+    build.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    build.add_argument("--shard-size", type=int, default=256, help="first guesses per shard")
+
+    lookup = sub.add_parser("lookup", help="query a built table")
+    lookup.add_argument("guess", help="first guess, e.g. crane")
+    lookup.add_argument("colors", help="feedback as g/y/b letters, e.g. bbyby")
+    lookup.add_argument("--out", default=OPENER_TABLE_DIR, help="table directory")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.time()
+        table = build_table(
+            args.out, args.mode, args.top_n, args.limit, args.workers, args.shard_size,
+            progress=lambda done, total: print(f"\r   {done}/{total} shards", end="", flush=True),
+        )
+        print(f"\n✅ Built {len(table)} entries for {table.meta['guesses']} first guesses "
+              f"in {time.time() - start:.1f}s -> {args.out}")
+    else:
+        colors = _parse_colors(args.colors)
+        if colors is None:
+            lookup.error(f"colors must be 5 of g/y/b (or 2/1/0), got {args.colors!r}")
+        result = OpenerTable.load(args.out).lookup(args.guess, colors)
+        if result is None:
+            print(f"❌ No entry for {args.guess.upper()} {args.colors}")
+        else:
+            count, words = result
+            print(f"{count} candidates left. Top {len(words)}: {words}")
@@ -0,0 +1,162 @@
+# query.py
+from functools import lru_cache
+
+import numpy as np
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+ANY = (1 << 26) - 1
+WORD_LENGTH = 5
+
+# Characters with regex meaning outside a class; the planner only handles
+# '^', '$', '.', '[...]' and '{n}', so any other one means "use the regex"
+SPECIAL = set("\\|()*+?{}[]^$.")
+
+class QueryPlan:
+    """
+    A solve() pattern translated into one allowed-letter set per position.
+
+    masks -> tuple of 5 ints, bit i set when LETTERS[i] is allowed there
+    """
+
+    def __init__(self, masks):
+        self.masks = tuple(masks)
+        # (5, 26) lookup so a position filter is a single gather per column
+        self.allowed = np.array(
+            [[bool(mask >> c & 1) for c in range(26)] for mask in self.masks], dtype=bool
+        )
+
+    def __repr__(self):
+        return f"QueryPlan({self.describe()!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, QueryPlan) and self.masks == other.masks
+
+    def __hash__(self):
+        return hash(self.masks)
+
+    def describe(self):
+        """The plan as one character class per position, e.g. 'a[^xz]...'."""
+        parts = []
+        for mask in self.masks:
+            letters = "".join(c for i, c in enumerate(LETTERS) if mask >> i & 1)
+            if mask == ANY:
+                parts.append(".")
+            elif len(letters) == 1:
+                parts.append(letters)
+            else:
+                parts.append(f"[{letters}]")
+        return "".join(parts)
+
+    @property
+    def matches_nothing(self):
+        return any(mask == 0 for mask in self.masks)
+
+    def select(self, stats, must_contain=(), excluded=(), idx=None):
+        """
+        Indices into ``stats.words`` that satisfy the plan plus letter
+        constraints, in lexicon order. ``idx`` restricts the search.
+        """
+        letters = stats.letters if idx is None else stats.letters[idx]
+        keep = np.ones(len(letters), dtype=bool)
+        if self.matches_nothing:
+            keep[:] = False
+        else:
+            for pos, mask in enumerate(self.masks):
+                if mask != ANY:
+                    keep &= self.allowed[pos][letters[:, pos]]
+        contains = stats.contains if idx is None else stats.contains[idx]
+        for ch in set(must_contain):
+            keep &= contains[:, LETTERS.index(ch)]
+        for ch in set(excluded):
+            keep &= ~contains[:, LETTERS.index(ch)]
+        found = np.flatnonzero(keep)
+        return found if idx is None else idx[found]
+
+
+def plannable_letters(letters):
+    """Whether must_contain / excluded entries can run on the letter index."""
+    return all(len(ch) == 1 and ch in LETTERS for ch in letters)
+
+
+def _parse_class(pattern, i):
+    """Parse '[...]' starting after the '['. Returns (mask, next index) or None."""
+    negate = pattern.startswith("^", i)
+    if negate:
+        i += 1
+    mask = 0
+    first = True
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "]" and not first:
+            return (ANY & ~mask if negate else mask), i + 1
+        if c in "\\[":
+            return None
+        if i + 2 < len(pattern) and pattern[i + 1] == "-" and pattern[i + 2] != "]":
+            lo, hi = c, pattern[i + 2]
+            if lo > hi:
+                return None
+            for ch in LETTERS:
+                if lo <= ch <= hi:
+                    mask |= 1 << LETTERS.index(ch)
+            i += 3
+        else:
+            if c in LETTERS:
+                mask |= 1 << LETTERS.index(c)
+            i += 1
+        first = False
+    return None
+
+
+@lru_cache(maxsize=1024)
+def compile_pattern(pattern):
+    """
+    Translate a solve() pattern into a ``QueryPlan``, or None when it uses
+    constructs the planner does not handle (alternation, groups,
+    backreferences, escapes, open-ended quantifiers, flags). Plans are
+    cached by pattern string.
+
+    Handles '^', '$', literals, '.', '[abc]', '[^abc]', 'a-z' ranges and
+    exact repeats like '.{3}'. Like re.match, the pattern is anchored at
+    the start; without '$' trailing positions are unconstrained.
+    """
+    i = 1 if pattern.startswith("^") else 0
+    atoms = []
+    anchored_end = False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "$":
+            if i != len(pattern) - 1:
+                return None
+            anchored_end = True
+            break
+        if c == ".":
+            mask, i = ANY, i + 1
+        elif c == "[":
+            parsed = _parse_class(pattern, i + 1)
+            if parsed is None:
+                return None
+            mask, i = parsed
+        elif c in SPECIAL:
+            return None
+        else:
+            # A literal that is not a lowercase letter can never match a word
+            mask = 1 << LETTERS.index(c) if c in LETTERS else 0
+            i += 1
+
+        count = 1
+        if pattern.startswith("{", i):
+            end = pattern.find("}", i)
+            if end == -1 or not pattern[i + 1:end].isdigit():
+                return None
+            count, i = int(pattern[i + 1:end]), end + 1
+        if i < len(pattern) and pattern[i] in "*+?{":
+            return None
+        if len(atoms) + count > WORD_LENGTH:
+            # Longer than any word; stop before expanding a huge repeat.
+            # Only a later alternation could still match, and that needs re.
+            return None if "|" in pattern[i:] else QueryPlan([0] * WORD_LENGTH)
+        atoms.extend([mask] * count)
+
+    if anchored_end and len(atoms) < WORD_LENGTH:
+        return QueryPlan([0] * WORD_LENGTH)
+    return QueryPlan(atoms + [ANY] * (WORD_LENGTH - len(atoms)))
@@ -0,0 +1,224 @@
+# ranking.py
+import numpy as np
+import wordfreq
+
+from wordlists import load_lexicon
+
+# Answer prior: a sigmoid over each word's frequency rank in the lexicon.
+# Words well inside the top PRIOR_CENTER get a prior near 1, the long tail of
+# rare dictionary words fades towards 0 over roughly PRIOR_WIDTH ranks.
+PRIOR_CENTER = 3000
+PRIOR_WIDTH = 500
+
+# Expected-mass scoring compares MAX_GUESSES guesses against the MAX_ANSWERS
+# most likely answers; the remaining tail carries negligible prior mass.
+MAX_GUESSES = 400
+MAX_ANSWERS = 3000
+
+ALL_GREEN = 3 ** 5 - 1
+
+# ---------- Precomputed Arrays ----------
+
+class WordStats:
+    """
+    Per-word NumPy arrays for a lexicon, built once and shared by every
+    ranking call.
+
+    letters  -> (N, 5) uint8 letter codes (a=0 ... z=25)
+    contains -> (N, 26) bool, whether each word contains each letter
+    freq     -> wordfreq frequency of each word
+    unique   -> number of distinct letters in each word
+    answer   -> (N,) bool, whether each word can be the solution
+    prior    -> answer prior: uniform over a curated answer list, otherwise
+                the sigmoid over frequency rank
+    counts   -> letter_counts() over the possible answers
+
+    ``answers`` is the curated answer list, if any; without one every word
+    is a possible answer.
+    """
+
+    def __init__(self, words, answers=None, center=PRIOR_CENTER, width=PRIOR_WIDTH):
+        self.words = tuple(words)
+        self.index = {w: i for i, w in enumerate(self.words)}
+        self.letters = encode(self.words)
+        self.contains = np.zeros((len(self.words), 26), dtype=bool)
+        self.contains[np.arange(len(self.words))[:, None], self.letters] = True
+        self.freq = np.array([wordfreq.word_frequency(w, 'en') for w in self.words])
+        self.unique = np.array([len(set(w)) for w in self.words])
+
+        self.curated = answers is not None
+        if self.curated:
+            self.answer = np.zeros(len(self.words), dtype=bool)
+            self.answer[self.indices([w for w in answers if w in self.index])] = True
+            self.prior = self.answer.astype(float)
+        else:
+            self.answer = np.ones(len(self.words), dtype=bool)
+            rank = np.empty(len(self.words))
+            rank[np.argsort(-self.freq, kind="stable")] = np.arange(len(self.words))
+            self.prior = 1.0 / (1.0 + np.exp((rank - center) / width))
+        self.answer_indices = np.flatnonzero(self.answer)
+        self.counts = letter_counts(self, self.answer_indices)
+
+    def __contains__(self, word):
+        return word in self.index
+
+    def indices(self, words):
+        return np.fromiter((self.index[w] for w in words), dtype=np.intp, count=len(words))
+
+
+def encode(words):
+    """Letter codes for a sequence of lowercase 5-letter words."""
+    if not words:
+        return np.zeros((0, 5), dtype=np.uint8)
+    return np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).reshape(-1, 5) - ord("a")
+
+
+_stats = {}
+
+def word_stats(lexicon=None):
+    """Cached ``WordStats`` for a ``wordlists.Lexicon`` (default: load_lexicon())."""
+    lexicon = lexicon or load_lexicon()
+    stats = _stats.get(lexicon.key)
+    if stats is None:
+        stats = _stats[lexicon.key] = WordStats(lexicon.allowed, lexicon.answers if lexicon.curated else None)
+    return stats
+
+# ---------- Feedback ----------
+
+def feedback_codes(guesses, answers):
+    """
+    Wordle feedback for every (guess, answer) pair as base-3 codes
+    (gray=0, yellow=1, green=2, position 0 least significant).
+
+    guesses -> (M, 5) letter codes
+    answers -> (K, 5) letter codes
+    Returns an (M, K) uint8 array; ``ALL_GREEN`` marks a solve.
+    """
+    g = guesses[:, None, :]
+    a = answers[None, :, :]
+    green = g == a
+    codes = np.zeros(green.shape[:2], dtype=np.uint8)
+    weight = 1
+    for i in range(5):
+        gi = g[:, :, i]
+        # Copies of this letter in the answer not already matched in place
+        available = ((a == gi[:, :, None]) & ~green).sum(axis=2)
+        # Earlier non-green copies in the guess claim those first
+        claimed = np.zeros_like(available)
+        for j in range(i):
+            claimed += (g[:, :, j] == gi) & ~green[:, :, j]
+        yellow = ~green[:, :, i] & (available > claimed)
+        codes += (2 * green[:, :, i] + yellow).astype(np.uint8) * weight
+        weight *= 3
+    return codes
+
+# ---------- Rankers ----------
+
+def rank_frequency(stats, idx):
+    """Frequency plus a small unique-letter bonus, most common first."""
+    score = stats.freq[idx] + stats.unique[idx] * 0.01
+    return idx[np.argsort(-score, kind="stable")]
+
+
+def rank_bayes(stats, idx, max_guesses=MAX_GUESSES, max_answers=MAX_ANSWERS):
+    """
+    Rank candidates by prior-weighted expected remaining mass.
+
+    For each guess, the candidates' prior mass is split by feedback
+    pattern; the expected mass left afterwards is sum(mass^2) / total, with
+    the guess's own mass removed since guessing the answer ends the game.
+    Scored guesses come first (lowest expected mass), then everything else
+    by prior.
+    """
+    prior = stats.prior[idx]
+    by_prior = idx[np.argsort(-prior, kind="stable")]
+    if len(idx) <= 2:
+        return by_prior
+
+    answers = by_prior[:max_answers]
+    guesses = by_prior[:max_guesses]
+    weights = stats.prior[answers]
+    total = weights.sum()
+    if total == 0:
+        # No candidate can be the answer (e.g. non-answers from a curated
+        # lexicon); weigh them equally rather than dividing by zero
+        weights = np.ones(len(answers))
+        total = float(len(answers))
+
+    codes = feedback_codes(stats.letters[guesses], stats.letters[answers]).astype(np.intp)
+    rows = np.arange(len(guesses))[:, None] * (ALL_GREEN + 1)
+    mass = np.bincount(
+        (codes + rows).ravel(),
+        weights=np.broadcast_to(weights, codes.shape).ravel(),
+        minlength=len(guesses) * (ALL_GREEN + 1),
+    ).reshape(len(guesses), ALL_GREEN + 1)
+
+    expected = ((mass ** 2).sum(axis=1) - mass[:, ALL_GREEN] ** 2) / total
+    order = np.argsort(expected, kind="stable")
+    return np.concatenate([guesses[order], by_prior[max_guesses:]])
+
+
+def letter_counts(stats, idx):
+    """
+    Letter statistics over the words ``idx``.
+    Returns (positional, overall): a (5, 26) count of each letter at each
+    position, and a (26,) count of words containing each letter.
+    """
+    rows = stats.letters[idx].astype(np.intp) + np.arange(5) * 26
+    positional = np.bincount(rows.ravel(), minlength=5 * 26).reshape(5, 26)
+    overall = stats.contains[idx].sum(axis=0)
+    return positional, overall
+
+
+def rank_positional(stats, idx, counts=None):
+    """
+    Rank by how common each word's letters are among the candidates: the
+    count of its letter at each position plus the count of words sharing
+    each of its distinct letters. ``counts`` may be passed in when the
+    caller already maintains them (see session.SolverSession).
+    """
+    positional, overall = counts if counts is not None else letter_counts(stats, idx)
+    letters = stats.letters[idx]
+    score = positional[np.arange(5), letters].sum(axis=1)
+    score = score + stats.contains[idx] @ overall
+    return idx[np.argsort(-score, kind="stable")]
+
+
+RANKERS = {
+    "frequency": rank_frequency,
+    "bayes": rank_bayes,
+    "positional": rank_positional,
+}
+
+def rank_indices(stats, idx, mode="frequency"):
+    """Return the words at ``idx`` ordered by the ranker named ``mode``."""
+    if mode not in RANKERS:
+        raise ValueError(f"Unknown ranking mode {mode!r}; choose from {sorted(RANKERS)}")
+    if len(idx) == 0:
+        return []
+    return [stats.words[i] for i in RANKERS[mode](stats, idx)]
+
+def word_score(word):
+    """The rank_frequency() score for a single word, inside the lexicon or not."""
+    return wordfreq.word_frequency(word, 'en') + len(set(word)) * 0.01
+
+def rank_words(words, mode="frequency"):
+    """
+    Return ``words`` ordered by the ranker named ``mode``.
+
+    Words outside the lexicon (unknown, wrong length, not lowercase) have
+    no row in the precomputed arrays. They are scored one at a time with
+    word_score() and follow the ranked lexicon words; in frequency mode
+    that is the same score, so everything is sorted together.
+    """
+    if mode not in RANKERS:
+        raise ValueError(f"Unknown ranking mode {mode!r}; choose from {sorted(RANKERS)}")
+    words = list(words)
+    stats = word_stats()
+    known = [w for w in words if w in stats]
+    if len(known) == len(words):
+        return rank_indices(stats, stats.indices(known), mode)
+    if mode == "frequency":
+        return sorted(words, key=word_score, reverse=True)
+    unknown = [w for w in words if w not in stats]
+    return rank_indices(stats, stats.indices(known), mode) + sorted(unknown, key=word_score, reverse=True)
@@ -0,0 +1,124 @@
+# session.py
+import numpy as np
+
+from ranking import RANKERS, letter_counts, rank_positional, word_stats
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+# The app's color markers as the digits used by ranking.feedback_codes()
+COLOR_CODES = {"⬜": 0, "🟨": 1, "🟩": 2}
+
+def colors_code(colors):
+    """Base-3 feedback code for a list of color markers, position 0 least significant."""
+    return sum(COLOR_CODES[c] * 3 ** i for i, c in enumerate(colors))
+
+def position_constraint(stats, pos, letter, color):
+    """
+    Mask of lexicon words consistent with one feedback square, using the
+    app's rules: green fixes the position, yellow requires the letter
+    anywhere, gray forbids it anywhere. ``color`` is a COLOR_CODES digit.
+    """
+    code = LETTERS.index(letter)
+    if color == 2:
+        return stats.letters[:, pos] == code
+    if color == 1:
+        return stats.contains[:, code]
+    return ~stats.contains[:, code]
+
+class SolverSession:
+    """
+    One game's surviving candidates plus letter statistics over them.
+
+    Guesses only ever remove candidates, so the per-position and overall
+    letter counts are updated by subtracting the eliminated words instead
+    of recounting the survivors.
+
+    alive      -> (N,) bool mask over the lexicon, starting at the possible answers
+    positional -> (5, 26) count of each letter at each position
+    overall    -> (26,) count of surviving words containing each letter
+    """
+
+    def __init__(self, stats=None):
+        self.stats = stats or word_stats()
+        self.alive = self.stats.answer.copy()
+        self.positional = self.stats.counts[0].copy()
+        self.overall = self.stats.counts[1].copy()
+        self.green = {}
+        self.yellow = set()
+        self.gray = set()
+        self.guesses = []
+
+    def __len__(self):
+        return int(self.positional[0].sum())
+
+    def candidate_indices(self):
+        return np.flatnonzero(self.alive)
+
+    def candidates(self):
+        return [self.stats.words[i] for i in self.candidate_indices()]
+
+    def add_guess(self, word, colors):
+        """
+        Apply one guess with the app's "🟩" / "🟨" / "⬜" markers, using the
+        same constraints as solver.constraints_from_guesses(). Raises
+        ValueError, leaving the session unchanged, unless ``word`` is five
+        letters a-z with one marker each.
+        """
+        if len(word) != 5 or any(ch not in LETTERS for ch in word):
+            raise ValueError(f"Guess must be five letters a-z, got {word!r}")
+        if len(colors) != 5 or any(c not in COLOR_CODES for c in colors):
+            raise ValueError(f"Expected five of {sorted(COLOR_CODES)}, got {colors!r}")
+        self.guesses.append((word, list(colors)))
+        keep = self.alive.copy()
+        for i, (letter, color) in enumerate(zip(word, colors)):
+            if color == "🟩":  # green
+                self.green[i] = letter
+            elif color == "🟨":  # yellow
+                self.yellow.add(letter)
+            elif color == "⬜":  # gray
+                self.gray.add(letter)
+            if color in COLOR_CODES:
+                keep &= position_constraint(self.stats, i, letter, COLOR_CODES[color])
+        self.eliminate(np.flatnonzero(self.alive & ~keep))
+
+    def eliminate(self, idx):
+        """Remove the words ``idx`` (all currently alive) and update the counts."""
+        if len(idx) == 0:
+            return
+        positional, overall = letter_counts(self.stats, idx)
+        self.positional -= positional
+        self.overall -= overall
+        self.alive[idx] = False
+
+    def suggestions(self, mode="frequency"):
+        """Surviving candidates ranked by ``mode``."""
+        idx = self.candidate_indices()
+        if len(idx) == 0:
+            return []
+        if mode == "positional":
+            ranked = rank_positional(self.stats, idx, (self.positional, self.overall))
+        else:
+            ranked = RANKERS[mode](self.stats, idx)
+        return [self.stats.words[i] for i in ranked]
+
+    def deferred_suggestions(self, mode="frequency"):
+        """
+        A zero-argument callable returning ``suggestions(mode)`` for the
+        current candidates. It works on a snapshot, so it is safe to run on
+        another thread while this session takes further guesses.
+        """
+        snapshot = SolverSession.__new__(SolverSession)
+        snapshot.stats = self.stats
+        snapshot.alive = self.alive.copy()
+        snapshot.positional = self.positional.copy()
+        snapshot.overall = self.overall.copy()
+        return lambda: snapshot.suggestions(mode)
+
+    def heatmap(self):
+        """Positional letter shares as {letter: [share at position 1..5]} for letters still in play."""
+        total = max(len(self), 1)
+        return {
+            LETTERS[c]: [round(n / total, 3) for n in self.positional[:, c]]
+            for c in np.flatnonzero(self.overall)
+        }
+
@@ -1,127 +1,121 @@
-# solver.py
-import os
-import re
-import nltk
-from collections import Counter
-import wordfreq
-
-# --- Configure local NLTK data directory ---
-BASE_DIR = os.path.dirname(__file__)
-NLTK_DATA_DIR = os.path.join(BASE_DIR, "nltk_data")
-os.makedirs(NLTK_DATA_DIR, exist_ok=True)
-
-# Make sure our custom dir is first in the search path
-if NLTK_DATA_DIR not in nltk.data.path:
-    nltk.data.path.insert(0, NLTK_DATA_DIR)
-
-# --- Ensure corpus is available ---
-try:
-    nltk.corpus.words.words()
-except LookupError:
-    # Download to the local project folder
-    nltk.download("words", download_dir=NLTK_DATA_DIR)
-
-# ---------- Core Functions ----------
-
-def load_word_list():
-    """
-    Return list of all 5-letter English words (lowercase).
-    Uses multiple sources for comprehensive coverage including Wordle-specific words.
-    """
-    # Get words from NLTK
-    nltk_words = {w.lower() for w in nltk.corpus.words.words() if len(w) == 5 and w.isalpha()}
-    
-    # Get common 5-letter words from wordfreq
-    wordfreq_words = set()
-    try:
-        # Get comprehensive word list from wordfreq
-        common_words = wordfreq.get_frequency_dict('en', wordlist='large')
-        wordfreq_words = {w.lower() for w in common_words.keys() if len(w) == 5 and w.isalpha()}
-    except:
-        pass  # Fallback to NLTK only if wordfreq fails
-    
-    # Add some additional Wordle-specific words that might be missing
-    additional_words = {
-        'miaou', 'miaow', 'miaul', 'miaul', 'miaow', 'miaou',  # cat sounds
-        'qajaq', 'qanat', 'qapik', 'qibla', 'qophs', 'qorma',  # Q words
-        'xenon', 'xylem', 'xerox', 'xeric', 'xenon',  # X words
-        'zebra', 'zesty', 'zilch', 'zonal', 'zoned',  # Z words
-        'fjord', 'fjeld', 'fjall',  # Fj words
-        'cwtch', 'crwth', 'cwtch',  # Welsh words
-        'pygmy', 'pzazz', 'pzazz',  # P words
-        'vying', 'vying', 'vying',  # V words
-        'jumbo', 'jumpy', 'jumpy',  # J words
-        'kayak', 'kayak', 'kayak',  # K words
-        'waltz', 'waltz', 'waltz',  # W words
-        'yacht', 'yacht', 'yacht',  # Y words
-        'zebra', 'zebra', 'zebra',  # Z words
-        'audio', 'audio', 'audio',  # A words
-        'eerie', 'eerie', 'eerie',  # E words
-        'ouija', 'ouija', 'ouija',  # O words
-        'queue', 'queue', 'queue',  # Q words
-        'pizza', 'pizza', 'pizza',  # P words
-        'jazzy', 'jazzy', 'jazzy',  # J words
-        'fuzzy', 'fuzzy', 'fuzzy',  # F words
-        'buzzy', 'buzzy', 'buzzy',  # B words
-        'hazel', 'hazel', 'hazel',  # H words
-        'mazel', 'mazel', 'mazel',  # M words
-        'razor', 'razor', 'razor',  # R words
-        'major', 'major', 'major',  # M words
-        'minor', 'minor', 'minor',  # M words
-        'motor', 'motor', 'motor',  # M words
-        'color', 'color', 'color',  # C words
-        'favor', 'favor', 'favor',  # F words
-        'labor', 'labor', 'labor',  # L words
-        'humor', 'humor', 'humor',  # H words
-        'rumor', 'rumor', 'rumor',  # R words
-        'tumor', 'tumor', 'tumor',  # T words
-        'vigor', 'vigor', 'vigor',  # V words
-        'error', 'error', 'error',  # E words
-        'mirror', 'mirror', 'mirror',  # M words (6 letters, but common)
-        'terror', 'terror', 'terror',  # T words (6 letters, but common)
-        'horror', 'horror', 'horror',  # H words (6 letters, but common)
-    }
-    
-    # Filter additional words to only 5-letter words
-    additional_words = {w for w in additional_words if len(w) == 5}
-    
-    # Combine all sources
-    all_words = nltk_words.union(wordfreq_words).union(additional_words)
-    return sorted(all_words)
-
-def score_words(words):
-    """
-    Rank words by frequency (common words first) and letter frequency.
-    """
-    def word_score(word):
-        # Get word frequency (higher is more common)
-        freq_score = wordfreq.word_frequency(word, 'en')
-        # Bonus for unique letters
-        unique_letters = len(set(word))
-        return freq_score + (unique_letters * 0.01)
-    
-    return sorted(words, key=word_score, reverse=True)
-
-def solve(pattern, must_contain=None, excluded=None):
-    """
-    Filter & rank candidate words.
-
-    pattern      -> regex like '^a..le$'
-    must_contain -> list of letters that must be present
-    excluded     -> list of letters that cannot be present
-    """
-    must_contain = must_contain or []
-    excluded = excluded or []
-
-    words = load_word_list()
-    regex = re.compile(pattern)
-
-    candidates = [w for w in words if regex.match(w)]
-
-    if must_contain:
-        candidates = [w for w in candidates if all(ch in w for ch in must_contain)]
-
-    if excluded:
-        candidates = [w for w in candidates if all(ch not in w for ch in excluded)]
-
-    return score_words(candidates)
+# solver.py
+import re
+
+from query import compile_pattern, plannable_letters
+from ranking import rank_indices, rank_words, word_stats
+from wordlists import build_lexicon, load_lexicon
+
+# ---------- Core Functions ----------
+
+def load_word_list(sources=None):
+    """
+    Return list of all 5-letter English words (lowercase).
+    Uses multiple sources for comprehensive coverage including Wordle-specific words.
+
+    sources -> list of wordlists.WordSource plugins; defaults to the
+               configured lexicon's allowed guesses (see
+               wordlists.load_lexicon(): $WORDLE_ALLOWED plus
+               $WORDLE_ANSWERS, else NLTK, wordfreq 'large' and the extra
+               Wordle words)
+    """
+    if sources is None:
+        return list(load_lexicon().allowed)
+    return list(build_lexicon(sources))
+
+def score_words(words, mode="frequency"):
+    """
+    Rank words by frequency (common words first) and letter frequency.
+
+    mode -> "frequency": word frequency plus a unique-letter bonus
+            "bayes": prior-weighted expected remaining mass (see ranking.py)
+    """
+    return rank_words(words, mode)
+
+def solve(pattern, must_contain=None, excluded=None, mode="frequency"):
+    """
+    Filter & rank candidate words. Only the lexicon's possible answers are
+    candidates (every word unless $WORDLE_ANSWERS names an answer list).
+
+    pattern      -> regex like '^a..le$'
+    must_contain -> list of letters that must be present
+    excluded     -> list of letters that cannot be present
+    mode         -> ranking mode passed to score_words()
+    """
+    must_contain = must_contain or []
+    excluded = excluded or []
+
+    # Fast path: translate the pattern into per-position letter sets and
+    # filter on the precomputed letter index
+    plan = compile_pattern(pattern) if isinstance(pattern, str) else None
+    if plan is not None and plannable_letters(must_contain) and plannable_letters(excluded):
+        stats = word_stats()
+        idx = stats.answer_indices if stats.curated else None
+        return rank_indices(stats, plan.select(stats, must_contain, excluded, idx), mode)
+
+    words = load_lexicon().answers
+    regex = re.compile(pattern)
+
+    candidates = [w for w in words if regex.match(w)]
+
+    if must_contain:
+        candidates = [w for w in candidates if all(ch in w for ch in must_contain)]
+
+    if excluded:
+        candidates = [w for w in candidates if all(ch not in w for ch in excluded)]
+
+    return score_words(candidates, mode)
+
+def constraints_from_guesses(guesses):
+    """
+    Turn a guess history into solve() arguments.
+
+    guesses -> list of (word, colors) pairs, colors being the app's
+               "🟩" / "🟨" / "⬜" markers
+    Returns (pattern, must_contain, excluded).
+    """
+    pattern = ["."] * 5
+    yellow_letters = []
+    gray_letters = []
+
+    for g, c in guesses:
+        for i, (letter, color) in enumerate(zip(g, c)):
+            if color == "🟩":  # green
+                pattern[i] = letter
+            elif color == "🟨":  # yellow
+                yellow_letters.append(letter)
+            elif color == "⬜":  # gray
+                gray_letters.append(letter)
+
+    return "^" + "".join(pattern) + "$", yellow_letters, gray_letters
+
+def canonical_key(pattern, must_contain=None, excluded=None):
+    """
+    Canonical cache key for a solve() call. Letter lists are deduplicated
+    and sorted, so histories that imply the same constraints collide.
+    """
+    must = "".join(sorted(set(must_contain or [])))
+    excl = "".join(sorted(set(excluded or [])))
+    return f"{pattern}|{must}|{excl}"
+
+def game_state_key(guesses):
+    """Canonical cache key for a guess history."""
+    return canonical_key(*constraints_from_guesses(guesses))
+
+def feedback(guess, answer):
+    """
+    Wordle colors for ``guess`` against ``answer`` as the app's markers.
+    Repeated letters are only marked yellow as often as the answer has
+    unmatched copies of them.
+    """
+    colors = ["⬜"] * len(guess)
+    unmatched = []
+    for i, (g, a) in enumerate(zip(guess, answer)):
+        if g == a:
+            colors[i] = "🟩"
+        else:
+            unmatched.append(a)
+    for i, g in enumerate(guess):
+        if colors[i] != "🟩" and g in unmatched:
+            colors[i] = "🟨"
+            unmatched.remove(g)
+    return colors
@@ -0,0 +1,187 @@
+# suggestion_cache.py
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# ---------- Disk Store ----------
+
+class SqliteStore:
+    """
+    Suggestion store in a local sqlite file, shared by every worker process
+    that points at the same path. Each operation opens (and closes) its own
+    connection so the store is safe to use from Streamlit's script threads.
+    Keys must identify the word list, since the file outlives any one process.
+
+    ttl      -> seconds before a row is considered stale (None = never)
+    max_rows -> rows kept; every put() drops expired rows, then the oldest
+    """
+
+    def __init__(self, path, ttl=None, max_rows=100_000, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._clock = clock
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS suggestions "
+                "(key TEXT PRIMARY KEY, words TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS suggestions_created ON suggestions (created)")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """A connection wrapped in a transaction, closed on exit."""
+        with contextlib.closing(sqlite3.connect(self.path, timeout=30)) as conn:
+            with conn:
+                yield conn
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM suggestions").fetchone()[0]
+
+    def get(self, key):
+        """Return the stored word tuple for ``key``, or None if absent or expired."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT words, created FROM suggestions WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        words, created = row
+        if self.ttl is not None and self._clock() - created > self.ttl:
+            return None
+        return tuple(words.split()) if words else ()
+
+    def put(self, key, words):
+        now = self._clock()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO suggestions (key, words, created) VALUES (?, ?, ?)",
+                (key, " ".join(words), now),
+            )
+            if self.ttl is not None:
+                conn.execute("DELETE FROM suggestions WHERE created < ?", (now - self.ttl,))
+            if self.max_rows is not None:
+                conn.execute(
+                    "DELETE FROM suggestions WHERE key IN "
+                    "(SELECT key FROM suggestions ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                )
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM suggestions")
+
+# ---------- In-Process Cache ----------
+
+class SuggestionCache:
+    """
+    Bounded LRU cache of ranked suggestions keyed by canonical game state
+    (see ``solver.game_state_key``), shared by all sessions in a process.
+
+    maxsize -> maximum number of game states kept in memory
+    ttl     -> seconds before an entry is considered stale (None = never)
+    store   -> optional second-level store such as ``SqliteStore``
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, store=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def _lookup(self, key):
+        """Return a live entry and mark it recently used. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        words, created = entry
+        if self.ttl is not None and self._clock() - created > self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return words
+
+    def _insert(self, key, words):
+        """Caller holds the lock."""
+        self._entries[key] = (words, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key):
+        """Return a list of suggestions for ``key``, or None on a miss."""
+        with self._lock:
+            words = self._lookup(key)
+            if words is not None:
+                self.hits += 1
+                return list(words)
+        if self.store is not None:
+            words = self.store.get(key)
+            if words is not None:
+                with self._lock:
+                    self.store_hits += 1
+                    self._insert(key, words)
+                return list(words)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, words):
+        words = tuple(words)
+        with self._lock:
+            self._insert(key, words)
+        if self.store is not None:
+            self.store.put(key, words)
+
+    def get_or_compute(self, key, compute):
+        """
+        Return cached suggestions for ``key``, calling ``compute()`` and
+        caching its result on a miss.
+        """
+        words = self.get(key)
+        if words is None:
+            words = list(compute())
+            self.put(key, words)
+        return words
+
+    def clear(self):
+        """Drop every entry, including those in the store."""
+        with self._lock:
+            self._entries.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self):
+        """Counters for monitoring; store hits are counted separately from hits."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -12,7 +12,10 @@ from unittest.mock import patch, MagicMock
 # Add the current directory to the path so we can import our modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from solver import load_word_list, solve, score_words
+from solver import load_word_list, solve, score_words, constraints_from_guesses, game_state_key, feedback
+from suggestion_cache import SuggestionCache, SqliteStore
+import wordlists
+from wordlists import FileSource, GzipSource, InlineSource, build_lexicon, lexicon_key
 
 class TestWordleSolver(unittest.TestCase):
     """Test cases for the Wordle Solver functionality."""
@@ -212,6 +215,582 @@ class TestWordleSolver(unittest.TestCase):
         
         print("✅ Word validation scenarios completed")
 
+class TestFeedback(unittest.TestCase):
+    """Test cases for Wordle feedback and the load-test helpers."""
+    
+    def test_feedback_colors(self):
+        """Test green/yellow/gray marking, including repeated letters."""
+        g, y, w = "🟩", "🟨", "⬜"
+        self.assertEqual(feedback("crane", "crane"), [g, g, g, g, g])
+        self.assertEqual(feedback("crane", "about"), [w, w, y, w, w])
+        # Only one 'e' in the answer, already matched in place
+        self.assertEqual(feedback("eerie", "crane"), [w, w, y, w, g])
+        # Two 'l's in the guess, one unmatched 'l' in the answer
+        self.assertEqual(feedback("llama", "hello"), [y, y, w, w, w])
+    
+    def test_load_test_percentile(self):
+        """Test the nearest-rank percentile used by load_test.py."""
+        from load_test import percentile
+        values = [0.5, 0.1, 0.4, 0.2, 0.3]
+        self.assertEqual(percentile(values, 50), 0.3)
+        self.assertEqual(percentile(values, 100), 0.5)
+        self.assertEqual(percentile(values, 0), 0.1)
+        self.assertEqual(percentile([], 90), 0.0)
+
+class TestRanking(unittest.TestCase):
+    """Test cases for the vectorized ranking modes."""
+    
+    def test_feedback_codes_match_feedback(self):
+        """Test that vectorized feedback codes agree with solver.feedback."""
+        import random
+        from ranking import encode, feedback_codes
+        
+        words = random.Random(0).sample(load_word_list(), 60) + ['eerie', 'llama', 'hello', 'crane']
+        codes = feedback_codes(encode(words), encode(words))
+        digits = {"⬜": 0, "🟨": 1, "🟩": 2}
+        for i, guess in enumerate(words):
+            for j, answer in enumerate(words):
+                expected = sum(digits[c] * 3 ** k for k, c in enumerate(feedback(guess, answer)))
+                self.assertEqual(codes[i, j], expected, f"{guess} vs {answer}")
+    
+    def test_frequency_mode_order(self):
+        """Test that frequency mode keeps the frequency + unique-letter ordering."""
+        import wordfreq
+        words = ['about', 'their', 'would', 'other', 'after', 'qajaq']
+        expected = sorted(words, key=lambda w: wordfreq.word_frequency(w, 'en') + len(set(w)) * 0.01, reverse=True)
+        self.assertEqual(score_words(words), expected)
+    
+    def test_bayes_mode(self):
+        """Test that bayes mode ranks every candidate exactly once."""
+        print("Testing bayes ranking...")
+        
+        candidates = solve('^.....$', ['a', 'e'], ['x', 'z'])
+        ranked = solve('^.....$', ['a', 'e'], ['x', 'z'], mode="bayes")
+        self.assertEqual(sorted(ranked), sorted(candidates))
+        
+        # Common words carry far more prior mass than rare ones
+        from ranking import word_stats
+        stats = word_stats()
+        self.assertGreater(stats.prior[stats.index['about']], 0.9)
+        self.assertLess(stats.prior[stats.index['qajaq']], 0.1)
+        print(f"✅ Bayes ranking top suggestion: {ranked[0]}")
+    
+    def test_bayes_mode_without_prior_mass(self):
+        """Test that bayes ranks candidates whose prior is all zero without NaNs."""
+        import warnings
+        import numpy as np
+        from ranking import WordStats, rank_bayes
+        stats = WordStats(['crane', 'slate', 'stare', 'roate', 'soare', 'irate'], answers=['crane'])
+        idx = np.array([1, 2, 3, 4, 5])
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            ranked = rank_bayes(stats, idx)
+        # Same order as when all of them are equally likely answers
+        uniform = WordStats(stats.words, answers=[stats.words[i] for i in idx])
+        self.assertEqual(list(ranked), list(rank_bayes(uniform, idx)))
+
+    def test_unknown_mode(self):
+        """Test that an unknown ranking mode is rejected."""
+        with self.assertRaises(ValueError):
+            score_words(['about'], mode="nope")
+    
+    def test_words_outside_lexicon(self):
+        """Test that words missing from the lexicon are ranked without extending it."""
+        import ranking
+        cached = len(ranking._stats)
+        
+        self.assertEqual(score_words(['mirror']), ['mirror'])
+        self.assertEqual(sorted(score_words(['APPLE', 'crane'])), ['APPLE', 'crane'])
+        self.assertEqual(sorted(score_words(['zzzzz', 'about', 'abcdefghijklmno'])), ['abcdefghijklmno', 'about', 'zzzzz'])
+        
+        # Other modes rank the lexicon words first, then the rest by frequency
+        ranked = score_words(['qqqqq', 'crane', 'slate', 'mirror'], mode="bayes")
+        self.assertEqual(sorted(ranked[:2]), ['crane', 'slate'])
+        self.assertEqual(ranked[2:], ['mirror', 'qqqqq'])
+        self.assertEqual(len(ranking._stats), cached)
+
+class TestSolverSession(unittest.TestCase):
+    """Test cases for the incrementally maintained solver session."""
+    
+    def setUp(self):
+        from session import SolverSession
+        g, y, w = "🟩", "🟨", "⬜"
+        self.history = [("crane", [w, w, y, w, y]), ("slate", [w, w, y, g, y])]
+        self.session = SolverSession()
+        for word, colors in self.history:
+            self.session.add_guess(word, colors)
+    
+    def test_candidates_match_solve(self):
+        """Test that the session keeps exactly the words solve() returns."""
+        print("Testing solver session candidates...")
+        
+        expected = solve(*constraints_from_guesses(self.history))
+        self.assertEqual(self.session.candidates(), sorted(expected))
+        self.assertEqual(self.session.suggestions(), expected)
+        self.assertEqual(len(self.session), len(expected))
+        print(f"✅ Session narrowed to {len(expected)} candidates")
+    
+    def test_counts_match_recount(self):
+        """Test that counts updated by subtraction equal a full recount."""
+        import numpy as np
+        from ranking import letter_counts
+        positional, overall = letter_counts(self.session.stats, self.session.candidate_indices())
+        np.testing.assert_array_equal(self.session.positional, positional)
+        np.testing.assert_array_equal(self.session.overall, overall)
+    
+    def test_constraint_summary(self):
+        """Test that green/yellow/gray summaries are tracked incrementally."""
+        self.assertEqual(self.session.green, {3: 't'})
+        self.assertEqual(self.session.yellow, {'a', 'e'})
+        self.assertEqual(self.session.gray, {'c', 'r', 'n', 's', 'l'})
+        heatmap = self.session.heatmap()
+        self.assertNotIn('c', heatmap)
+        self.assertEqual(heatmap['t'][3], 1.0)
+    
+    def test_positional_mode(self):
+        """Test that the positional ranker matches with maintained or fresh counts."""
+        ranked = self.session.suggestions("positional")
+        self.assertEqual(sorted(ranked), self.session.candidates())
+        self.assertEqual(ranked, score_words(self.session.candidates(), mode="positional"))
+
+    def test_invalid_guess_leaves_session_unchanged(self):
+        """Test that guesses outside a-z are rejected before any state changes."""
+        before = (self.session.candidates(), list(self.session.guesses), set(self.session.gray))
+        for word, colors in [("cafés", ["⬜"] * 5), ("CRANE", ["⬜"] * 5), ("crane", ["⬜"] * 4)]:
+            with self.assertRaises(ValueError):
+                self.session.add_guess(word, colors)
+        self.assertEqual((self.session.candidates(), self.session.guesses, self.session.gray), before)
+
+class TestQueryPlanner(unittest.TestCase):
+    """Test cases for the regex-to-index query planner."""
+    
+    def test_compile_pattern(self):
+        """Test translation of anchors, literals, dots, classes and repeats."""
+        from query import compile_pattern
+        self.assertEqual(compile_pattern('^a.e..$').describe(), "a.e..")
+        self.assertEqual(compile_pattern('^[aeiou]....$').describe(), "[aeiou]....")
+        self.assertEqual(compile_pattern('^.{3}[a-c]s$').describe(), "...[abc]s")
+        self.assertEqual(compile_pattern('^ab').describe(), "ab...")
+        negated = compile_pattern('^[^abc]....$').describe()
+        self.assertEqual(negated[:2], "[d")
+        # Too long or too short with '$' can never match a 5-letter word
+        self.assertTrue(compile_pattern('^......$').matches_nothing)
+        self.assertTrue(compile_pattern('^....$').matches_nothing)
+        self.assertTrue(compile_pattern('^.{100000000}$').matches_nothing)
+        self.assertIsNone(compile_pattern('^......|a'))
+        # Cached by pattern string
+        self.assertIs(compile_pattern('^a.e..$'), compile_pattern('^a.e..$'))
+    
+    def test_fallback_constructs(self):
+        """Test that untranslatable constructs fall back to the regex scan."""
+        from query import compile_pattern
+        for pattern in ['^(a)...\\1$', '^a|b....$', '^a.*$', '^\\w....$', '^a.?...$', '(?i)^a....$']:
+            self.assertIsNone(compile_pattern(pattern), pattern)
+    
+    def test_plan_matches_regex(self):
+        """Test that planned solves return exactly what the regex scan does."""
+        import re
+        print("Testing query planner against regex scan...")
+        
+        words = load_word_list()
+        cases = [
+            ('^.....$', [], []), ('^a.e..$', ['o'], ['r', 't']), ('^[^aeiou]....$', ['a'], []),
+            ('^[a-m][aeiou].{2}s$', [], ['x']), ('^ab', [], []), ('^.{5}$', ['q'], []),
+            ('^A....$', [], []), ('^......$', [], []), ('^a|e....$', [], []),
+        ]
+        for pattern, must, excl in cases:
+            regex = re.compile(pattern)
+            expected = [w for w in words if regex.match(w)
+                        and all(ch in w for ch in must) and all(ch not in w for ch in excl)]
+            self.assertEqual(sorted(solve(pattern, must, excl)), expected, pattern)
+        print("✅ Planner agrees with regex scan")
+
+class TestOpenerTable(unittest.TestCase):
+    """Test cases for the precomputed opener tables."""
+    
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_lookup_matches_session(self):
+        """Test that table lookups equal live turn-two suggestions."""
+        from openers import build_table
+        from session import SolverSession
+        print("Testing opener table...")
+        
+        table = build_table(self.tmp.name, top_n=5, limit=3, workers=1)
+        self.assertEqual(table.meta["guesses"], 3)
+        for row in range(0, len(table), 37):
+            key = int(table.keys[row])
+            guess = table.stats.words[key // 243]
+            colors = [["⬜", "🟨", "🟩"][key % 243 // 3 ** i % 3] for i in range(5)]
+            session = SolverSession()
+            session.add_guess(guess, colors)
+            self.assertEqual(table.lookup(guess.upper(), colors), (len(session), session.suggestions()[:5]))
+        
+        self.assertIsNone(table.lookup("zzzzz", ["⬜"] * 5))
+        self.assertIsNone(table.lookup(guess, colors[:4]))
+        print(f"✅ Opener table has {len(table)} entries")
+
+    def test_parse_colors(self):
+        """Test that CLI feedback is validated instead of raising KeyError."""
+        from openers import _parse_colors
+        self.assertEqual(_parse_colors("GyB21"), ["🟩", "🟨", "⬜", "🟩", "🟨"])
+        self.assertIsNone(_parse_colors("bbqby"))
+        self.assertIsNone(_parse_colors("bby"))
+
+    def test_interrupted_pool_is_terminated(self):
+        """Test that a failing parallel build terminates its workers instead of joining them."""
+        import openers
+
+        pool = MagicMock()
+        pool.imap_unordered.return_value = iter(["shard"])
+        def interrupt(done, total):
+            raise KeyboardInterrupt
+        with patch("multiprocessing.Pool", return_value=pool), self.assertRaises(KeyboardInterrupt):
+            openers.build_table(self.tmp.name, limit=3, workers=2, progress=interrupt)
+        pool.terminate.assert_called_once()
+        pool.close.assert_not_called()
+
+    def test_finished_build_skips_pool(self):
+        """Test that rerunning a build whose shards all exist starts no worker pool."""
+        import openers
+        with patch.object(openers, "_merge_shards", side_effect=KeyboardInterrupt), self.assertRaises(KeyboardInterrupt):
+            openers.build_table(self.tmp.name, limit=3, workers=1)
+        with patch("multiprocessing.Pool", side_effect=AssertionError("pool started")):
+            table = openers.build_table(self.tmp.name, limit=3, workers=2)
+        self.assertEqual(table.meta["guesses"], 3)
+    
+    def test_resume_skips_finished_shards(self):
+        """Test that an interrupted build only redoes unfinished shards."""
+        import openers
+        
+        def interrupt(done, total):
+            raise KeyboardInterrupt
+        with self.assertRaises(KeyboardInterrupt):
+            openers.build_table(self.tmp.name, limit=3, workers=1, shard_size=1, progress=interrupt)
+        
+        with patch.object(openers, "_shard_worker", wraps=openers._shard_worker) as worker:
+            openers.build_table(self.tmp.name, limit=3, workers=1, shard_size=1)
+        self.assertEqual(worker.call_count, 2)
+        self.assertEqual([n for n in os.listdir(self.tmp.name) if n.startswith("shards-")], [])
+
+class TestBackgroundRanker(unittest.TestCase):
+    """Test cases for background suggestion computation."""
+    
+    def setUp(self):
+        import threading
+        from background import BackgroundRanker
+        self.cache = SuggestionCache()
+        self.ranker = BackgroundRanker(self.cache, max_workers=1)
+        self.gate = threading.Event()
+    
+    def tearDown(self):
+        self.gate.set()
+        self.ranker.shutdown()
+    
+    def blocked(self, words):
+        def compute():
+            self.gate.wait(5)
+            return words
+        return compute
+    
+    def test_result_fills_cache(self):
+        """Test that finished jobs return suggestions and cache them."""
+        self.assertIsNone(self.cache.get("k"))
+        job = self.ranker.submit("k", lambda: ["crane", "slate"])
+        self.assertEqual(job.result(), ["crane", "slate"])
+        self.assertTrue(job.done())
+        self.assertEqual(self.cache.get("k"), ["crane", "slate"])
+        # The caller's lookup is the only miss for the state
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_failed_job_returns_none(self):
+        """Test that a ranking that raises is logged and reported as no result."""
+        def compute():
+            raise RuntimeError("ranking failed")
+        job = self.ranker.submit("k", compute)
+        with self.assertLogs("background", level="ERROR"):
+            self.assertIsNone(job.result())
+        self.assertTrue(job.done())
+        self.assertNotIn("k", self.cache)
+
+        # The key is free to be retried
+        self.assertEqual(self.ranker.submit("k", lambda: ["crane"]).result(), ["crane"])
+
+    def test_superseded_job_is_cancelled(self):
+        """Test that a queued job nobody waits for is cancelled."""
+        print("Testing background job cancellation...")
+        
+        running = self.ranker.submit("first", self.blocked(["about"]))
+        queued = self.ranker.submit("second", self.blocked(["brave"]))
+        queued.cancel()
+        self.assertTrue(queued.done())
+        self.assertIsNone(queued.result())
+        self.assertEqual(self.ranker.stats()["cancelled"], 1)
+        
+        self.gate.set()
+        self.assertEqual(running.result(), ["about"])
+        self.assertIsNone(self.cache.get("second"))
+        print("✅ Superseded job cancelled")
+    
+    def test_identical_jobs_are_shared(self):
+        """Test that sessions asking for the same state share one computation."""
+        compute = MagicMock(side_effect=self.blocked(["crane"]))
+        first = self.ranker.submit("k", compute)
+        second = self.ranker.submit("k", compute)
+        # One session leaving does not cancel the other's job
+        first.cancel()
+        self.gate.set()
+        self.assertEqual(second.result(), ["crane"])
+        compute.assert_called_once()
+        self.assertEqual(self.ranker.stats()["joined"], 1)
+        self.assertEqual(self.ranker.stats()["inflight"], 0)
+    
+    def test_deferred_suggestions_use_snapshot(self):
+        """Test that deferred rankings ignore guesses made after submission."""
+        from session import SolverSession
+        g, y, w = "🟩", "🟨", "⬜"
+        session = SolverSession()
+        session.add_guess("crane", [w, w, y, w, y])
+        expected = session.suggestions("positional")
+        deferred = session.deferred_suggestions("positional")
+        session.add_guess("slate", [w, w, y, g, y])
+        self.assertEqual(deferred(), expected)
+
+class TestWordSources(unittest.TestCase):
+    """Test cases for the pluggable word-list sources and build cache."""
+    
+    def setUp(self):
+        """Create a scratch directory for word files and cache artifacts."""
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        if name.endswith(".gz"):
+            import gzip
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return path
+    
+    def test_normalization_and_dedup(self):
+        """Test that words are normalized and deduplicated across sources."""
+        print("Testing source normalization...")
+        
+        answers = FileSource(self.write("answers.txt", "# answers\nCrane\nslate\n\ncrane\nabc\ncafés\n"))
+        allowed = GzipSource(self.write("allowed.gz", "SLATE\nroate\nsix-one\n"))
+        words = build_lexicon([answers, allowed, InlineSource(["Roate", "qajaq"])], cache_dir=self.cache_dir)
+        
+        self.assertEqual(words, ('crane', 'qajaq', 'roate', 'slate'))
+        print("✅ Sources normalized and deduplicated")
+    
+    def test_gz_extension_is_decompressed(self):
+        """Test that FileSource reads .gz files transparently."""
+        path = self.write("words.txt.gz", "adieu\naudio\n")
+        self.assertEqual(list(FileSource(path)), ['adieu', 'audio'])
+    
+    def test_build_cache_reuse(self):
+        """Test that identical configurations reuse the cached artifact."""
+        print("Testing lexicon build cache...")
+        
+        path = self.write("words.txt", "crane\nslate\n")
+        sources = [FileSource(path)]
+        first = build_lexicon(sources, cache_dir=self.cache_dir)
+        key = lexicon_key(sources)
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, f"{key}.txt")))
+        
+        # A fresh process would only have the on-disk artifact
+        wordlists._lexicons.clear()
+        with patch.object(FileSource, "iter_words", side_effect=AssertionError("rebuilt")):
+            self.assertEqual(build_lexicon([FileSource(path)], cache_dir=self.cache_dir), first)
+        
+        # Different settings produce a different key
+        self.assertNotEqual(lexicon_key(sources, length=6), key)
+        print("✅ Cached lexicon reused")
+    
+    def test_content_change_triggers_rebuild(self):
+        """Test that editing a source file changes the key and the words."""
+        path = self.write("words.txt", "crane\n")
+        key1 = lexicon_key([FileSource(path)])
+        self.assertEqual(build_lexicon([FileSource(path)], cache_dir=self.cache_dir), ('crane',))
+        
+        self.write("words.txt", "crane\nslate\n")
+        self.assertNotEqual(lexicon_key([FileSource(path)]), key1)
+        self.assertEqual(build_lexicon([FileSource(path)], cache_dir=self.cache_dir), ('crane', 'slate'))
+    
+    def test_load_word_list_custom_sources(self):
+        """Test that load_word_list accepts custom sources."""
+        words = load_word_list([InlineSource(["zebra", "adieu"])])
+        self.assertEqual(words, ['adieu', 'zebra'])
+
+    def test_answers_and_allowed_from_env(self):
+        """Test that WORDLE_ANSWERS / WORDLE_ALLOWED select the game lexicon."""
+        print("Testing configured lexicon...")
+        from ranking import word_stats
+        from session import SolverSession
+
+        env = {
+            "WORDLE_ANSWERS": self.write("answers.txt", "crane\nslate\nstare\n"),
+            "WORDLE_ALLOWED": self.write("allowed.txt", "roate\nsoare\ncrane\n"),
+        }
+        with patch.dict(os.environ, env):
+            lexicon = wordlists.load_lexicon()
+            self.assertTrue(lexicon.curated)
+            self.assertEqual(lexicon.answers, ('crane', 'slate', 'stare'))
+            self.assertEqual(lexicon.allowed, ('crane', 'roate', 'slate', 'soare', 'stare'))
+            self.assertEqual(load_word_list(), list(lexicon.allowed))
+
+            # Only answers are candidates; the other allowed words are just guesses
+            self.assertEqual(sorted(solve('^.....$', [], [])), ['crane', 'slate', 'stare'])
+            self.assertEqual(sorted(solve('^s.a(r|t)e$', [], [])), ['slate', 'stare'])
+            session = SolverSession(word_stats(lexicon))
+            session.add_guess('roate', ['⬜', '⬜', '🟩', '🟩', '🟩'])
+            self.assertEqual(session.candidates(), ['slate'])
+
+        self.assertNotEqual(wordlists.load_lexicon().key, lexicon.key)
+        print("✅ Configured lexicon used for candidates")
+
+    def test_configured_lexicon_is_memoized(self):
+        """Test that repeated load_lexicon() calls skip fingerprinting until a file changes."""
+        path = self.write("answers.txt", "crane\n")
+        with patch.dict(os.environ, {"WORDLE_ANSWERS": path}):
+            first = wordlists.load_lexicon()
+            with patch.object(FileSource, "fingerprint", side_effect=AssertionError("re-fingerprinted")), \
+                 patch.object(wordlists.WordfreqSource, "fingerprint", side_effect=AssertionError("re-fingerprinted")):
+                self.assertIs(wordlists.load_lexicon(), first)
+
+            self.write("answers.txt", "crane\nslate\n")
+            self.assertEqual(wordlists.load_lexicon().answers, ('crane', 'slate'))
+
+    def test_source_interface(self):
+        """Test that sources must implement the interface and repr without I/O."""
+        with self.assertRaises(TypeError):
+            wordlists.WordSource()
+        missing = wordlists.NltkSource(data_dir=os.path.join(self.tmp.name, "missing"))
+        with patch.object(wordlists.NltkSource, "fingerprint", side_effect=AssertionError("I/O in repr")):
+            self.assertIn("corpus='words'", repr(missing))
+        self.assertEqual(repr(FileSource("answers.txt")), "FileSource(path='answers.txt', encoding='utf-8')")
+        self.assertEqual(repr(InlineSource(["crane", "slate"])), "InlineSource(<2 words>)")
+
+    def test_nltk_source_reads_zipped_corpus(self):
+        """Test that NltkSource handles the corpus as downloaded, inside words.zip."""
+        import zipfile
+        data_dir = os.path.join(self.tmp.name, "nltk_data")
+        os.makedirs(os.path.join(data_dir, "corpora"))
+        with zipfile.ZipFile(os.path.join(data_dir, "corpora", "words.zip"), "w") as z:
+            z.writestr("words/en", "Crane\nslate\n")
+
+        import nltk
+        source = wordlists.NltkSource(data_dir=data_dir)
+        # Keep any installed corpus out of the search path
+        with patch.object(nltk.data, "path", []):
+            self.assertEqual(list(source), ['Crane', 'slate'])
+            self.assertTrue(source.fingerprint().startswith("nltk:words:"))
+            self.assertEqual(build_lexicon([source], cache_dir=self.cache_dir), ('crane', 'slate'))
+
+class TestSuggestionCache(unittest.TestCase):
+    """Test cases for the shared suggestion cache."""
+    
+    def test_equivalent_histories_collide(self):
+        """Test that guess histories implying the same constraints share a key."""
+        print("Testing canonical game-state keys...")
+        
+        g, y, w = "🟩", "🟨", "⬜"
+        history1 = [("crane", [w, w, y, w, y]), ("slate", [w, w, y, w, y])]
+        history2 = [("slate", [w, w, y, w, y]), ("crane", [w, w, y, w, y])]
+        self.assertEqual(game_state_key(history1), game_state_key(history2))
+        
+        pattern, must, excl = constraints_from_guesses([("about", [g, w, w, w, y])])
+        self.assertEqual(pattern, "^a....$")
+        self.assertEqual(must, ["t"])
+        self.assertEqual(excl, ["b", "o", "u"])
+        self.assertNotEqual(game_state_key(history1), game_state_key([("about", [g, w, w, w, y])]))
+        print("✅ Equivalent histories share a key")
+    
+    def test_lru_eviction_and_counters(self):
+        """Test LRU eviction order and hit/miss/eviction counters."""
+        cache = SuggestionCache(maxsize=2)
+        cache.put("a", ["about"])
+        cache.put("b", ["brave"])
+        self.assertEqual(cache.get("a"), ["about"])  # "b" is now least recent
+        cache.put("c", ["crane"])
+        
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), ["crane"])
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (2, 1, 1))
+        self.assertEqual(stats["size"], 2)
+    
+    def test_ttl_expiry(self):
+        """Test that entries older than the TTL are dropped."""
+        now = [0.0]
+        cache = SuggestionCache(ttl=10, clock=lambda: now[0])
+        cache.put("a", ["about"])
+        now[0] = 5
+        self.assertEqual(cache.get("a"), ["about"])
+        now[0] = 20
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+    
+    def test_get_or_compute(self):
+        """Test that compute runs only on a miss."""
+        cache = SuggestionCache()
+        compute = MagicMock(return_value=["crane", "slate"])
+        self.assertEqual(cache.get_or_compute("k", compute), ["crane", "slate"])
+        self.assertEqual(cache.get_or_compute("k", compute), ["crane", "slate"])
+        compute.assert_called_once()
+    
+    def test_sqlite_store_shared(self):
+        """Test that separate caches share results through a sqlite store."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "suggestions.db")
+            SuggestionCache(store=SqliteStore(path)).put("k", ["crane", "slate"])
+            SuggestionCache(store=SqliteStore(path)).put("empty", [])
+            
+            other = SuggestionCache(store=SqliteStore(path))
+            self.assertEqual(other.get("k"), ["crane", "slate"])
+            self.assertEqual(other.get("empty"), [])
+            self.assertEqual(other.stats()["store_hits"], 2)
+            self.assertEqual(other.get("k"), ["crane", "slate"])
+            self.assertEqual(other.stats()["hits"], 1)
+
+    def test_sqlite_store_pruning_and_clear(self):
+        """Test that the sqlite store drops expired and oldest rows, and clear() reaches it."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            now = [0.0]
+            store = SqliteStore(os.path.join(tmp, "suggestions.db"), ttl=10, max_rows=2, clock=lambda: now[0])
+            store.put("a", ["about"])
+            now[0] = 5
+            store.put("b", ["brave"])
+            store.put("c", ["crane"])
+            self.assertEqual(len(store), 2)
+            self.assertIsNone(store.get("a"))
+
+            now[0] = 20
+            store.put("d", ["dwell"])
+            self.assertEqual(len(store), 1)
+            self.assertEqual(store.get("d"), ("dwell",))
+
+            cache = SuggestionCache(store=store)
+            cache.put("e", ["eerie"])
+            cache.clear()
+            self.assertEqual(len(store), 0)
+            self.assertIsNone(cache.get("e"))
+
 class TestAppIntegration(unittest.TestCase):
     """Test cases for app integration and user scenarios."""
     
@@ -267,6 +846,14 @@ def run_tests():
     
     # Add test cases
     suite.addTests(loader.loadTestsFromTestCase(TestWordleSolver))
+    suite.addTests(loader.loadTestsFromTestCase(TestFeedback))
+    suite.addTests(loader.loadTestsFromTestCase(TestRanking))
+    suite.addTests(loader.loadTestsFromTestCase(TestSolverSession))
+    suite.addTests(loader.loadTestsFromTestCase(TestQueryPlanner))
+    suite.addTests(loader.loadTestsFromTestCase(TestOpenerTable))
+    suite.addTests(loader.loadTestsFromTestCase(TestBackgroundRanker))
+    suite.addTests(loader.loadTestsFromTestCase(TestWordSources))
+    suite.addTests(loader.loadTestsFromTestCase(TestSuggestionCache))
     suite.addTests(loader.loadTestsFromTestCase(TestAppIntegration))
     
     # Run tests
@@ -0,0 +1,407 @@
+# wordlists.py
+import abc
+import functools
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+BASE_DIR = os.path.dirname(__file__)
+NLTK_DATA_DIR = os.path.join(BASE_DIR, "nltk_data")
+LEXICON_CACHE_DIR = os.path.join(BASE_DIR, ".lexicon_cache")
+
+# Bump when normalization or the artifact format changes so old builds are ignored
+LEXICON_FORMAT_VERSION = 1
+
+# Wordle-specific words that the NLTK and wordfreq lists tend to miss
+ADDITIONAL_WORDS = (
+    'miaou', 'miaow', 'miaul',  # cat sounds
+    'qajaq', 'qanat', 'qapik', 'qibla', 'qophs', 'qorma',  # Q words
+    'xenon', 'xylem', 'xerox', 'xeric',  # X words
+    'zebra', 'zesty', 'zilch', 'zonal', 'zoned',  # Z words
+    'fjord', 'fjeld', 'fjall',  # Fj words
+    'cwtch', 'crwth',  # Welsh words
+    'pygmy', 'pzazz', 'vying', 'jumbo', 'jumpy', 'kayak', 'waltz', 'yacht',
+    'audio', 'eerie', 'ouija', 'queue', 'pizza', 'jazzy', 'fuzzy', 'buzzy',
+    'hazel', 'mazel', 'razor', 'major', 'minor', 'motor', 'color', 'favor',
+    'labor', 'humor', 'rumor', 'tumor', 'vigor', 'error',
+)
+
+# ---------- Sources ----------
+
+class WordSource(abc.ABC):
+    """
+    Base class for word-list plugins.
+
+    Subclasses stream raw words from ``iter_words()`` and describe their
+    content with ``fingerprint()``. Two sources with the same fingerprint
+    must yield the same words, since the fingerprint keys the build cache.
+    """
+
+    @abc.abstractmethod
+    def iter_words(self):
+        """Yield raw words; normalization happens in stream_words()."""
+
+    @abc.abstractmethod
+    def fingerprint(self):
+        """Content identity of the source. May read files or locate corpora."""
+
+    def files(self):
+        """
+        Paths whose size and mtime change whenever this source's content
+        does, letting load_lexicon() skip fingerprinting. Sources whose
+        content lives elsewhere return ().
+        """
+        return ()
+
+    def __iter__(self):
+        return self.iter_words()
+
+    def __repr__(self):
+        # Constructor arguments only; fingerprint() may do I/O or download
+        args = ", ".join(f"{name}={value!r}" for name, value in vars(self).items())
+        return f"{type(self).__name__}({args})"
+
+
+_file_digests = {}
+
+def _file_digest(path):
+    """
+    SHA-256 of a file's bytes, memoized on (path, size, mtime) so repeated
+    builds only re-read files that actually changed.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    digest = _file_digests.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _file_digests[key] = digest
+    return digest
+
+
+class FileSource(WordSource):
+    """
+    One word per line from a text file. Files ending in ``.gz`` are
+    decompressed on the fly; blank lines and ``#`` comments are skipped.
+    """
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+
+    def _open(self):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, "rt", encoding=self.encoding)
+        return open(self.path, "r", encoding=self.encoding)
+
+    def iter_words(self):
+        with self._open() as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line
+
+    def fingerprint(self):
+        return f"file:{_file_digest(self.path)}"
+
+    def files(self):
+        return (self.path,)
+
+
+class GzipSource(FileSource):
+    """A gzipped word file, regardless of its extension."""
+
+    def _open(self):
+        return gzip.open(self.path, "rt", encoding=self.encoding)
+
+    def fingerprint(self):
+        return f"gzip:{_file_digest(self.path)}"
+
+
+class InlineSource(WordSource):
+    """Words supplied directly from Python."""
+
+    def __init__(self, words):
+        self.words = tuple(words)
+
+    def iter_words(self):
+        return iter(self.words)
+
+    def __repr__(self):
+        return f"InlineSource(<{len(self.words)} words>)"
+
+    def fingerprint(self):
+        h = hashlib.sha256("\n".join(sorted(set(self.words))).encode("utf-8"))
+        return f"inline:{h.hexdigest()}"
+
+
+_corpus_pointers = {}
+
+class NltkSource(WordSource):
+    """
+    The NLTK ``words`` corpus. The corpus is downloaded into the local
+    ``nltk_data/`` folder the first time it is needed.
+    """
+
+    def __init__(self, corpus="words", data_dir=NLTK_DATA_DIR):
+        self.corpus = corpus
+        self.data_dir = data_dir
+
+    def _corpus_path(self):
+        """The corpus PathPointer, located (or downloaded) once per process."""
+        pointer = _corpus_pointers.get((self.corpus, self.data_dir))
+        if pointer is None:
+            pointer = _corpus_pointers[(self.corpus, self.data_dir)] = self._find_corpus()
+        return pointer
+
+    def _find_corpus(self):
+        import nltk
+
+        os.makedirs(self.data_dir, exist_ok=True)
+        # Make sure our custom dir is first in the search path
+        if self.data_dir not in nltk.data.path:
+            nltk.data.path.insert(0, self.data_dir)
+        resource = f"corpora/{self.corpus}/en"
+        try:
+            return nltk.data.find(resource)
+        except LookupError:
+            # Download to the local project folder
+            nltk.download(self.corpus, download_dir=self.data_dir)
+            return nltk.data.find(resource)
+
+    def iter_words(self):
+        # A PathPointer: the corpus may be a plain file or an entry in words.zip
+        with self._corpus_path().open(encoding="utf-8") as f:
+            for line in f:
+                yield line.strip()
+
+    def fingerprint(self):
+        pointer = self._corpus_path()
+        zipped = getattr(pointer, "zipfile", None)
+        if zipped is not None:
+            return f"nltk:{self.corpus}:{_file_digest(zipped.filename)}:{pointer.entry}"
+        return f"nltk:{self.corpus}:{_file_digest(pointer.path)}"
+
+    def files(self):
+        pointer = self._corpus_path()
+        zipped = getattr(pointer, "zipfile", None)
+        return (zipped.filename if zipped is not None else pointer.path,)
+
+
+class WordfreqSource(WordSource):
+    """
+    Every word in a wordfreq frequency list. The fingerprint is the wordfreq
+    version, so upgrading the package triggers a rebuild.
+    """
+
+    def __init__(self, lang="en", wordlist="large"):
+        self.lang = lang
+        self.wordlist = wordlist
+
+    def iter_words(self):
+        import wordfreq
+
+        for bucket in wordfreq.get_frequency_list(self.lang, wordlist=self.wordlist):
+            yield from bucket
+
+    def fingerprint(self):
+        return f"wordfreq:{_wordfreq_version()}:{self.lang}:{self.wordlist}"
+
+
+@functools.lru_cache(maxsize=1)
+def _wordfreq_version():
+    """The installed wordfreq version; fixed for the life of the process."""
+    from importlib.metadata import version
+
+    return version("wordfreq")
+
+
+def default_sources():
+    """The sources ``load_word_list()`` uses when none are given."""
+    return [NltkSource(), WordfreqSource("en", "large"), InlineSource(ADDITIONAL_WORDS)]
+
+
+def env_sources(name):
+    """
+    FileSources for the word files listed in the environment variable
+    ``name`` (separated by os.pathsep), or None if it is unset or empty.
+    """
+    paths = [p for p in os.environ.get(name, "").split(os.pathsep) if p]
+    return [FileSource(p) for p in paths] or None
+
+# ---------- Building ----------
+
+def normalize(word, length=5):
+    """
+    Return ``word`` lowercased if it is an ASCII word of ``length`` letters,
+    otherwise None.
+    """
+    word = word.strip().lower()
+    if len(word) == length and word.isascii() and word.isalpha():
+        return word
+    return None
+
+
+def lexicon_key(sources, length=5):
+    """Content hash of the sources and build settings."""
+    spec = {
+        "version": LEXICON_FORMAT_VERSION,
+        "length": length,
+        "sources": [s.fingerprint() for s in sources],
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def stream_words(sources, length=5):
+    """
+    Normalize and dedupe words from all sources in a single pass, yielding
+    each accepted word the first time it is seen.
+    """
+    seen = set()
+    for source in sources:
+        for raw in source.iter_words():
+            word = normalize(raw, length)
+            if word is not None and word not in seen:
+                seen.add(word)
+                yield word
+
+
+_lexicons = {}
+
+def build_lexicon(sources=None, length=5, cache_dir=LEXICON_CACHE_DIR):
+    """
+    Return the sorted word tuple for ``sources``.
+
+    Builds are keyed by ``lexicon_key()``: a hit in memory or in
+    ``cache_dir`` is returned without touching the sources again, and only
+    a change in source content or settings triggers a rebuild. Pass
+    ``cache_dir=None`` to skip the on-disk cache.
+    """
+    if sources is None:
+        sources = default_sources()
+    key = lexicon_key(sources, length)
+
+    words = _lexicons.get(key)
+    if words is not None:
+        return words
+
+    path = os.path.join(cache_dir, f"{key}.txt") if cache_dir else None
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            words = tuple(f.read().split())
+    else:
+        words = tuple(sorted(stream_words(sources, length)))
+        if path:
+            _write_artifact(path, words)
+
+    _lexicons[key] = words
+    return words
+
+
+class Lexicon:
+    """
+    The words a game is played with.
+
+    answers -> sorted tuple of words that can be the solution
+    allowed -> sorted tuple of accepted guesses, always including the answers
+    curated -> True when the answers come from their own list; otherwise
+               every allowed word is a possible answer
+    key     -> content hash of both source lists
+    """
+
+    def __init__(self, answers, allowed, curated, key):
+        self.answers = answers
+        self.allowed = allowed
+        self.curated = curated
+        self.key = key
+
+    def __repr__(self):
+        return f"Lexicon({len(self.answers)} answers, {len(self.allowed)} allowed, {self.key[:12]})"
+
+
+_game_lexicons = {}
+_configured_lexicons = {}
+
+def load_lexicon(answers=None, allowed=None, length=5, cache_dir=LEXICON_CACHE_DIR):
+    """
+    Return the ``Lexicon`` for a pair of source lists.
+
+    answers -> sources of possible solutions; defaults to the files in
+               $WORDLE_ANSWERS, else every allowed word
+    allowed -> sources of accepted guesses; defaults to the files in
+               $WORDLE_ALLOWED, else default_sources()
+
+    The configured lexicon (both left as None) is memoized on the
+    environment variables and the size and mtime of the source files, so
+    repeated calls skip fingerprinting the sources.
+    """
+    memo = None
+    if answers is None and allowed is None:
+        answers = env_sources("WORDLE_ANSWERS")
+        allowed = env_sources("WORDLE_ALLOWED") or default_sources()
+        memo = _source_state(answers, allowed, length, cache_dir)
+        lexicon = _configured_lexicons.get(memo)
+        if lexicon is not None:
+            return lexicon
+    if answers is None:
+        answers = env_sources("WORDLE_ANSWERS")
+    if allowed is None:
+        allowed = env_sources("WORDLE_ALLOWED") or default_sources()
+    spec = {
+        "answers": lexicon_key(answers, length) if answers else None,
+        "allowed": lexicon_key(allowed, length),
+    }
+    key = hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+    lexicon = _game_lexicons.get(key)
+    if lexicon is None:
+        allowed_words = build_lexicon(allowed, length, cache_dir)
+        if answers:
+            answer_words = build_lexicon(answers, length, cache_dir)
+            allowed_words = tuple(sorted(set(allowed_words).union(answer_words)))
+        else:
+            answer_words = allowed_words
+        lexicon = _game_lexicons[key] = Lexicon(answer_words, allowed_words, bool(answers), key)
+    if memo is not None:
+        _configured_lexicons[memo] = lexicon
+    return lexicon
+
+
+def _source_state(answers, allowed, length, cache_dir):
+    """Cheap identity of a source configuration: settings, size and mtime of each file."""
+    state = [length, cache_dir]
+    for source in (answers or []) + allowed:
+        state.append((type(source).__name__, tuple(sorted(vars(source).items()))))
+        for path in source.files():
+            stat = os.stat(path)
+            state.append((os.path.abspath(path), stat.st_size, stat.st_mtime_ns))
+    return tuple(state)
+
+
+def _write_artifact(path, words):
+    atomic_write(path, lambda f: f.write(("\n".join(words) + "\n").encode("utf-8")))
+
+
+def atomic_write(path, write):
+    """
+    Create ``path`` by calling ``write(f)`` on a temporary binary file in the
+    same directory and renaming it into place, so concurrent readers never
+    see a partial file.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise